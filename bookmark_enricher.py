@@ -90,6 +90,8 @@ def main() -> None:
         logger.info("Processing interrupted by user")
     except Exception as e:  # noqa: BLE001
         logger.error(f"Processing failed: {e}")
+    finally:
+        enricher.close()
 
 
 if __name__ == "__main__":
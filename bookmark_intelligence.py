@@ -18,6 +18,7 @@ from core.models import Bookmark
 from core.spinner import Spinner
 from core.web_extractor import WebExtractor
 from core.category_suggester import CategorySuggester
+from core.category_manager import sanitize_category_name
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -217,7 +218,7 @@ def main() -> None:
                             output_dir = args.input
                         else:
                             output_dir = os.path.dirname(args.input)
-                    names = [s.name.lower().replace(" ", "_") for s in suggestions]
+                    names = [sanitize_category_name(s.name) for s in suggestions]
                     created = intelligence.category_manager.create_categories(
                         names, output_dir
                     )
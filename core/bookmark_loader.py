@@ -6,11 +6,22 @@ import json
 import os
 import logging
 import csv
-from typing import Dict, List
+import shutil
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from .models import Bookmark
 
 logger = logging.getLogger(__name__)
 
+# Total file size above which files are read on threads; below it the pool
+# costs more than the file reads it overlaps
+PARALLEL_LOAD_MIN_BYTES = 8 * 1024 * 1024
+
+# Threads reading bookmark files at once
+LOAD_WORKERS = 4
+
 
 class BookmarkLoader:
     """Handles loading bookmarks from various sources."""
@@ -53,26 +64,43 @@ class BookmarkLoader:
         bookmarks: List[Bookmark] = []
         try:
             with open(file_path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
+                reader = csv.reader(f)
+                header = next(reader, [])
+                # Resolve column positions once instead of building a dict per row
+                columns = {name: i for i, name in enumerate(header)}
+                url_i = columns.get("url")
+                link_i = columns.get("link")
+                title_i = columns.get("title")
+                note_i = columns.get("note")
+                description_i = columns.get("description")
+                excerpt_i = columns.get("excerpt")
+                tags_i = columns.get("tags")
+                type_i = columns.get("type")
+
+                def field(row: List[str], index: Optional[int]) -> str:
+                    if index is None or index >= len(row):
+                        return ""
+                    return row[index]
+
                 filename = os.path.basename(file_path)
                 for row in reader:
-                    url = row.get("url") or row.get("link") or ""
+                    url = field(row, url_i) or field(row, link_i)
                     if not url:
                         continue
-                    title = row.get("title", "")
-                    note = row.get("note", "")
-                    excerpt = row.get("excerpt", "")
-                    description = note or row.get("description", "") or excerpt
+                    excerpt = field(row, excerpt_i)
+                    description = (
+                        field(row, note_i) or field(row, description_i) or excerpt
+                    )
                     tags = [
-                        t.strip() for t in row.get("tags", "").split(",") if t.strip()
+                        t.strip() for t in field(row, tags_i).split(",") if t.strip()
                     ]
                     bm = Bookmark(
                         url=url,
-                        title=title,
+                        title=field(row, title_i),
                         description=description,
                         excerpt=excerpt,
                         tags=tags,
-                        bookmark_type=row.get("type", "link"),
+                        bookmark_type=field(row, type_i) or "link",
                     )
                     bm.source_file = filename
                     bookmarks.append(bm)
@@ -97,22 +125,35 @@ class BookmarkLoader:
             return []
 
         all_bookmarks = []
-        json_files = []
 
-        # Find all JSON/CSV files
-        for filename in os.listdir(directory_path):
-            if filename.endswith(".json") or filename.endswith(".csv"):
-                json_files.append(os.path.join(directory_path, filename))
+        # Find all JSON/CSV files; scandir's entries already know their type
+        with os.scandir(directory_path) as entries:
+            sized_files = [
+                (entry.path, entry.stat().st_size)
+                for entry in entries
+                if entry.name.endswith((".json", ".csv")) and entry.is_file()
+            ]
 
-        if not json_files:
+        if not sized_files:
             logger.warning(f"No bookmark files found in {directory_path}")
             return []
 
-        logger.info(f"Found {len(json_files)} bookmark files to load")
+        logger.info(f"Found {len(sized_files)} bookmark files to load")
+
+        sized_files.sort()
+        json_files = [path for path, _ in sized_files]
+        total_bytes = sum(size for _, size in sized_files)
+
+        # Large collections overlap file reads on threads; map() keeps the
+        # sorted file order
+        workers = min(LOAD_WORKERS, len(json_files))
+        if workers > 1 and total_bytes >= PARALLEL_LOAD_MIN_BYTES:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(BookmarkLoader.load_from_file, json_files))
+        else:
+            results = [BookmarkLoader.load_from_file(f) for f in json_files]
 
-        # Load bookmarks from each file
-        for json_file in sorted(json_files):
-            bookmarks = BookmarkLoader.load_from_file(json_file)
+        for bookmarks in results:
             all_bookmarks.extend(bookmarks)
 
         logger.info(f"Total bookmarks loaded: {len(all_bookmarks)}")
@@ -134,15 +175,42 @@ class BookmarkLoader:
             return BookmarkLoader.save_to_raindrop_csv(bookmarks, file_path)
         try:
             data = [bookmark.to_dict() for bookmark in bookmarks]
-
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(
-                    data,
-                    f,
-                    indent=2,
-                    ensure_ascii=False,
-                    separators=(",", ": "),
-                )
+            content = json.dumps(
+                data,
+                indent=2,
+                ensure_ascii=False,
+                separators=(",", ": "),
+            ).encode("utf-8")
+
+            # Skip the write when the file already holds identical content
+            if (
+                os.path.isfile(file_path)
+                and os.path.getsize(file_path) == len(content)
+                and BookmarkLoader._read_bytes(file_path) == content
+            ):
+                logger.debug(f"No changes to save in {file_path}")
+                return True
+
+            # Write to a uniquely named sibling temp file and swap it in so a
+            # crash can't leave a truncated bookmark file behind. Creating it
+            # with 0o666 lets the umask set a new file's mode as open() would
+            tmp_path = os.path.join(
+                os.path.dirname(os.path.abspath(file_path)),
+                f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp",
+            )
+            created = False
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+                created = True
+                with os.fdopen(fd, "wb") as f:
+                    f.write(content)
+                if os.path.exists(file_path):
+                    shutil.copymode(file_path, tmp_path)
+                os.replace(tmp_path, file_path)
+            except BaseException:
+                if created and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
 
             logger.info(f"Saved {len(bookmarks)} bookmarks to {file_path}")
             return True
@@ -151,6 +219,12 @@ class BookmarkLoader:
             logger.error(f"Error saving to {file_path}: {e}")
             return False
 
+    @staticmethod
+    def _read_bytes(file_path: str) -> bytes:
+        """Return the raw contents of a file."""
+        with open(file_path, "rb") as f:
+            return f.read()
+
     @staticmethod
     def save_to_raindrop_csv(bookmarks: List[Bookmark], file_path: str) -> bool:
         """Save bookmarks to a Raindrop.io compatible CSV file."""
@@ -202,13 +276,10 @@ class BookmarkLoader:
             True if all files saved successfully, False otherwise
         """
         # Group bookmarks by source file
-        files_dict: dict[str, list[Bookmark]] = {}
+        files_dict: dict[str, list[Bookmark]] = defaultdict(list)
         for bookmark in bookmarks:
-            source_file = bookmark.source_file
-            if source_file:
-                if source_file not in files_dict:
-                    files_dict[source_file] = []
-                files_dict[source_file].append(bookmark)
+            if bookmark.source_file:
+                files_dict[bookmark.source_file].append(bookmark)
 
         success = True
 
@@ -246,6 +317,25 @@ class BookmarkLoader:
         """
         return [b for b in bookmarks if not b.is_enriched]
 
+    @staticmethod
+    def partition_enriched(
+        bookmarks: List[Bookmark],
+    ) -> Tuple[List[Bookmark], List[Bookmark]]:
+        """
+        Split bookmarks into enriched and unenriched in a single pass.
+
+        Args:
+            bookmarks: List of Bookmark objects
+
+        Returns:
+            Tuple of (enriched, unenriched) lists, each in input order
+        """
+        enriched: List[Bookmark] = []
+        unenriched: List[Bookmark] = []
+        for bookmark in bookmarks:
+            (enriched if bookmark.is_enriched else unenriched).append(bookmark)
+        return enriched, unenriched
+
     @staticmethod
     def get_stats(bookmarks: List[Bookmark]) -> Dict:
         """
@@ -260,31 +350,24 @@ class BookmarkLoader:
         if not bookmarks:
             return {}
 
-        enriched = BookmarkLoader.filter_enriched(bookmarks)
-        unenriched = BookmarkLoader.filter_unenriched(bookmarks)
-
-        # Count by source file
-        file_counts: dict[str, int] = {}
-        for bookmark in bookmarks:
-            file_counts[bookmark.source_file] = (
-                file_counts.get(bookmark.source_file, 0) + 1
-            )
-
-        # Count by domain
-        domain_counts: dict[str, int] = {}
+        enriched = 0
+        file_counts: Counter[str] = Counter()
+        domain_counts: Counter[str] = Counter()
         for bookmark in bookmarks:
+            if bookmark.is_enriched:
+                enriched += 1
+            file_counts[bookmark.source_file] += 1
             domain = bookmark.domain
             if domain:
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
+                domain_counts[domain] += 1
 
+        total = len(bookmarks)
         return {
-            "total": len(bookmarks),
-            "enriched": len(enriched),
-            "unenriched": len(unenriched),
-            "enrichment_percentage": (len(enriched) / len(bookmarks)) * 100,
+            "total": total,
+            "enriched": enriched,
+            "unenriched": total - enriched,
+            "enrichment_percentage": (enriched / total) * 100,
             "files": len(file_counts),
-            "file_counts": file_counts,
-            "top_domains": sorted(
-                domain_counts.items(), key=lambda x: x[1], reverse=True
-            )[:10],
+            "file_counts": dict(file_counts),
+            "top_domains": domain_counts.most_common(10),
         }
@@ -13,6 +13,14 @@ from .vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
+# Spaces and characters that are unsafe in filenames on common platforms
+_CATEGORY_NAME_TABLE = str.maketrans({c: "_" for c in ' /\\:*?"<>|\0'})
+
+
+def sanitize_category_name(name: str) -> str:
+    """Turn a suggested category name into a safe, lowercase file stem."""
+    return name.translate(_CATEGORY_NAME_TABLE).lower()
+
 
 class CategoryManager:
     """Manage bookmark categories and population."""
@@ -117,11 +125,8 @@ class CategoryManager:
                 bookmark = similar.bookmark
                 score = similar.similarity_score
 
-                # Skip if already in target category
-                if (
-                    bookmark.source_file
-                    and os.path.basename(bookmark.source_file) == target_filename
-                ):
+                # Skip if already in target category (source_file is a basename)
+                if bookmark.source_file == target_filename:
                     continue
 
                 if score >= threshold:
@@ -133,10 +138,7 @@ class CategoryManager:
             if not candidates:
                 for similar in search_result.similar_bookmarks[:limit]:
                     bookmark = similar.bookmark
-                    if (
-                        bookmark.source_file
-                        and os.path.basename(bookmark.source_file) == target_filename
-                    ):
+                    if bookmark.source_file == target_filename:
                         continue
                     candidates.append((bookmark, similar.similarity_score))
 
@@ -152,6 +154,9 @@ class CategoryManager:
         """
         Move bookmarks to a target category file.
 
+        Moved bookmarks stay in ``bookmarks`` with their ``source_file`` set to
+        the target category, so every affected file is written exactly once.
+
         Args:
             bookmarks_to_move: List of bookmarks to move
             target_category: Target category filename (e.g., "3d-printing.json")
@@ -171,28 +176,48 @@ class CategoryManager:
         target_path = os.path.join(base_dir, target_category)
 
         try:
-            # Load existing bookmarks in target category
-            target_bookmarks = []
-            if os.path.exists(target_path):
-                target_bookmarks = self.loader.load_from_file(target_path)
-
-            # Add new bookmarks to target
-            target_bookmarks.extend(bookmarks_to_move)
-
-            # Remove bookmarks from their original files and from the main list
-            for bookmark in bookmarks_to_move:
-                if bookmark in bookmarks:
-                    bookmarks.remove(bookmark)
-
-            # Save target category file
-            if not self.loader.save_to_file(target_bookmarks, target_path):
-                logger.error(f"Failed to save target category: {target_path}")
+            # The target's contents are normally already in memory; only read
+            # the file when it exists but none of its bookmarks were loaded.
+            extra_bookmarks: List[Bookmark] = []
+            if os.path.exists(target_path) and not any(
+                b.source_file == target_category for b in bookmarks
+            ):
+                extra_bookmarks = self.loader.load_from_file(target_path)
+                for bookmark in extra_bookmarks:
+                    bookmark.source_file = target_category
+
+            # Candidates are rebuilt from vector store metadata, so match on
+            # (url, source_file) rather than identity or full equality.
+            move_keys = [(b.url, b.source_file) for b in bookmarks_to_move]
+            wanted = set(move_keys)
+            old_sources = {source for _, source in wanted if source}
+            matched = set()
+            for bookmark in bookmarks:
+                key = (bookmark.url, bookmark.source_file)
+                if key in wanted:
+                    matched.add(key)
+                    bookmark.source_file = target_category
+            for bookmark, key in zip(bookmarks_to_move, move_keys):
+                if key not in matched:
+                    matched.add(key)
+                    bookmark.source_file = target_category
+                    bookmarks.append(bookmark)
+
+            # Save every file once; sources that were emptied need an explicit
+            # write because no remaining bookmark points at them.
+            if not self.loader.save_by_source_file(
+                bookmarks + extra_bookmarks, base_dir
+            ):
+                logger.error("Failed to update category files")
                 return False
 
-            # Save changes to original files (remove the moved bookmarks)
-            if not self.loader.save_by_source_file(bookmarks, base_dir):
-                logger.error("Failed to update source files")
-                return False
+            remaining_sources = {b.source_file for b in bookmarks}
+            for source_file in old_sources - remaining_sources:
+                if not self.loader.save_to_file(
+                    [], os.path.join(base_dir, source_file)
+                ):
+                    logger.error(f"Failed to update source file: {source_file}")
+                    return False
 
             logger.info(
                 "Successfully moved %d bookmarks to %s",
@@ -4,17 +4,32 @@ from __future__ import annotations
 
 import json
 import logging
-import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
-import ollama
 from .models import Bookmark
 from .vector_store import VectorStore
 from .progress_tracker import ProgressTracker
 
 logger = logging.getLogger(__name__)
 
+# Texts sent to the embedding backend per request
+EMBEDDING_BATCH_SIZE = 64
+
+# faiss k-means only pays off over sklearn on larger corpora
+FAISS_KMEANS_MIN_SAMPLES = 5000
+
+# Generation cap for the name/description JSON
+SUMMARY_MAX_TOKENS = 120
+
+# Cluster summaries requested at once; matches Ollama's default parallel slots
+SUMMARY_CONCURRENCY = 4
+
+_JSON_DECODER = json.JSONDecoder(strict=False)
+
 
 @dataclass
 class CategorySuggestion:
@@ -29,32 +44,66 @@ class CategorySuggestion:
 class CategorySuggester:
     """Analyze bookmarks and suggest new categories."""
 
-    def __init__(self, vector_store: VectorStore, llm_model: str = "llama3.1:8b"):
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        llm_model: str = "llama3.1:8b",
+    ):
         self.vector_store = vector_store
         self.llm_model = llm_model
+        self.ollama_client = vector_store.ollama_client
+
+    def _kmeans_labels(self, embeddings: np.ndarray, n_clusters: int) -> List[int]:
+        """Run k-means, preferring faiss for large sets when it is installed."""
+        if len(embeddings) >= FAISS_KMEANS_MIN_SAMPLES:
+            try:
+                import faiss  # type: ignore
+            except ImportError:
+                faiss = None
+
+            if faiss is not None:
+                data = np.ascontiguousarray(embeddings, dtype=np.float32)
+                # faiss defaults to a single restart, matching sklearn's n_init=1
+                kmeans = faiss.Kmeans(data.shape[1], n_clusters, niter=20, seed=42)
+                kmeans.train(data)
+                _, labels = kmeans.index.search(data, 1)
+                return labels.ravel().tolist()
+
+        from sklearn.cluster import KMeans  # type: ignore
+
+        # k-means++ seeding makes a single init reliable; elkan prunes distance
+        # computations with the triangle inequality on dense embeddings
+        kmeans = KMeans(
+            n_clusters=n_clusters, random_state=42, n_init=1, algorithm="elkan"
+        )
+        return kmeans.fit_predict(embeddings).tolist()
 
     def _cluster_embeddings(
-        self, embeddings: List[List[float]], use_kmeans: Optional[int] = None
+        self, embeddings: np.ndarray, use_kmeans: Optional[int] = None
     ) -> List[int]:
         """Cluster embedding vectors."""
         if use_kmeans:
-            from sklearn.cluster import KMeans  # type: ignore
-
-            kmeans = KMeans(n_clusters=use_kmeans, random_state=42)
-            labels = kmeans.fit_predict(embeddings)
-            return labels.tolist()
+            return self._kmeans_labels(embeddings, use_kmeans)
 
         try:
             import hdbscan  # type: ignore
 
+            # Re-saved bookmarks produce (near-)identical vectors; cluster each
+            # distinct vector once and copy its label back to the repeats
+            quantized = np.round(embeddings * 1000).astype(np.int32)
+            _, first, inverse = np.unique(
+                quantized, axis=0, return_index=True, return_inverse=True
+            )
+            unique_embeddings = embeddings[first]
+
             # More reasonable cluster size: 3-15 bookmarks per cluster
-            min_size = max(3, min(15, len(embeddings) // 50))
+            min_size = max(3, min(15, len(unique_embeddings) // 50))
             clusterer = hdbscan.HDBSCAN(
                 min_cluster_size=min_size,
                 min_samples=max(2, min_size // 2),  # Allow some flexibility
                 cluster_selection_epsilon=0.1,  # Allow slightly looser clusters
             )
-            labels = clusterer.fit_predict(embeddings)
+            labels = clusterer.fit_predict(unique_embeddings)[inverse.ravel()]
 
             # Count actual clusters (excluding noise -1)
             unique_labels = set(labels)
@@ -75,7 +124,6 @@ class CategorySuggester:
 
         except Exception as e:  # pragma: no cover - fallback path
             logger.warning(f"HDBSCAN failed ({e}), falling back to k-means")
-            from sklearn.cluster import KMeans
 
             # Aim for 3-8 clusters for good variety without overwhelming user
             k = max(3, min(8, len(embeddings) // 100))
@@ -83,35 +131,58 @@ class CategorySuggester:
                 k = max(2, len(embeddings) // 5)  # For smaller datasets
 
             logger.info(f"K-means: Creating {k} clusters")
-            kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-            labels = kmeans.fit_predict(embeddings)
-            return labels.tolist()
+            return self._kmeans_labels(embeddings, k)
+
+    @staticmethod
+    def _representative_order(
+        embeddings: np.ndarray,
+        sq_norms: np.ndarray,
+        indices: Sequence[int],
+        n: int = 5,
+    ) -> List[int]:
+        """Return cluster indices with the n closest to the centroid first."""
+        idx = np.asarray(indices)
+        members = embeddings[idx]
+        centroid = members.mean(axis=0)
+
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; the last term is the same
+        # for every member, so it doesn't affect the ranking
+        dists = sq_norms[idx] - 2.0 * (members @ centroid)
+        if len(idx) > n:
+            nearest = np.argpartition(dists, n)[:n]
+        else:
+            nearest = np.arange(len(idx))
+        nearest = nearest[np.argsort(dists[nearest], kind="stable")]
+
+        is_rest = np.ones(len(idx), dtype=bool)
+        is_rest[nearest] = False
+        return idx[nearest].tolist() + idx[is_rest].tolist()
+
+    @staticmethod
+    def _style_examples(bookmarks: Sequence[Bookmark]) -> str:
+        """Build the naming-style hint from the collection's category files."""
+        existing_names = {
+            b.source_file[:-5]
+            for b in bookmarks
+            if b.source_file and b.source_file.endswith(".json")
+        }
+        if not existing_names:
+            return ""
+
+        example_names = sorted(existing_names)[:5]  # Show up to 5 examples
+        return (
+            "Follow the existing naming style from these categories: "
+            f"{', '.join(example_names)}. "
+            "Match their format, length, and style conventions. "
+        )
 
-    def _generate_cluster_summary(self, bookmarks: Sequence[Bookmark]) -> dict:
+    def _generate_cluster_summary(
+        self, bookmarks: Sequence[Bookmark], style_examples: str = ""
+    ) -> dict:
         """Call LLM to get a name/description for a cluster."""
         sample = list(bookmarks)[:5]
         bullet_lines = [f"- {b.title}: {b.url}" for b in sample]
 
-        # Extract existing category names from source files to learn naming style
-        existing_names = set()
-        for bookmark in bookmarks:
-            if bookmark.source_file:
-                # Extract filename without path and extension
-                filename = os.path.basename(bookmark.source_file)
-                if filename.endswith(".json"):
-                    category_name = filename[:-5]  # Remove .json extension
-                    existing_names.add(category_name)
-
-        # Create examples of existing naming style
-        style_examples = ""
-        if existing_names:
-            example_names = sorted(list(existing_names))[:5]  # Show up to 5 examples
-            style_examples = (
-                "Follow the existing naming style from these categories: "
-                f"{', '.join(example_names)}. "
-                "Match their format, length, and style conventions. "
-            )
-
         prompt = (
             "Suggest a short category name and one sentence description for "
             "the following bookmarks. "
@@ -125,54 +196,60 @@ class CategorySuggester:
             + "\n".join(bullet_lines)
         )
         try:
-            response = ollama.generate(
-                model=self.llm_model, prompt=prompt, options={"temperature": 0.1}
+            response = self.ollama_client.generate(
+                model=self.llm_model,
+                prompt=prompt,
+                format="json",
+                options={"temperature": 0.1, "num_predict": SUMMARY_MAX_TOKENS},
             )
             text = response["response"].strip()
 
-            # Try to extract JSON more robustly
             start = text.find("{")
             if start == -1:
                 logger.warning(f"No JSON found in LLM response: {text[:100]}...")
                 return {"name": "Untitled", "description": ""}
 
-            # Find the matching closing brace
-            brace_count = 0
-            end = start
-            for i, char in enumerate(text[start:], start):
-                if char == "{":
-                    brace_count += 1
-                elif char == "}":
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end = i + 1
-                        break
-
-            if end <= start:
-                logger.warning(f"No matching closing brace found in: {text[:100]}...")
+            # format="json" normally yields a bare object; raw_decode still
+            # copes with servers that ignore it, and strict=False with raw
+            # newlines inside strings
+            try:
+                result, _ = _JSON_DECODER.raw_decode(text, start)
+            except json.JSONDecodeError as je:
+                logger.warning(f"JSON decode error: {je}. Raw text: {text[:100]}...")
                 return {"name": "Untitled", "description": ""}
 
-            json_text = text[start:end]
-            logger.debug(f"Extracted JSON: {json_text}")
+            if not isinstance(result, dict):
+                logger.warning(f"Unexpected JSON in LLM response: {text[:100]}...")
+                return {"name": "Untitled", "description": ""}
 
-            try:
-                return json.loads(json_text)
-            except json.JSONDecodeError as je:
-                logger.warning(f"JSON decode error: {je}. Raw JSON: {json_text}")
-                # Try to fix common issues
-                json_text = json_text.replace("\n", " ").replace("\r", " ")
-                try:
-                    return json.loads(json_text)
-                except json.JSONDecodeError:
-                    logger.error(
-                        f"Could not parse JSON even after cleanup: {json_text}"
-                    )
-                    return {"name": "Untitled", "description": ""}
+            logger.debug(f"Extracted JSON: {result}")
+            return result
 
         except Exception as e:  # pragma: no cover - network failures
             logger.error(f"LLM generation failed: {e}")
         return {"name": "Untitled", "description": ""}
 
+    def _summarize_clusters(
+        self, groups: List[List[Bookmark]], style_examples: str
+    ) -> Iterator[Tuple[List[Bookmark], dict]]:
+        """Yield (group, summary) pairs in order, summarizing in small waves.
+
+        Waves keep the LLM busy without requesting summaries for clusters
+        that suggest() will never reach once it has enough suggestions.
+        """
+        with ThreadPoolExecutor(max_workers=SUMMARY_CONCURRENCY) as pool:
+            for start in range(0, len(groups), SUMMARY_CONCURRENCY):
+                wave = groups[start : start + SUMMARY_CONCURRENCY]
+                metas = list(
+                    pool.map(
+                        lambda group: self._generate_cluster_summary(
+                            group, style_examples
+                        ),
+                        wave,
+                    )
+                )
+                yield from zip(wave, metas)
+
     def suggest(
         self,
         bookmarks: List[Bookmark],
@@ -182,16 +259,36 @@ class CategorySuggester:
         if not bookmarks:
             return []
 
-        texts = [b.search_text for b in bookmarks]
+        # Re-imported or mirrored bookmarks often share their text; embed each
+        # distinct text once and expand back to one row per bookmark
+        positions: dict[str, int] = {}
+        inverse = np.fromiter(
+            (positions.setdefault(b.search_text, len(positions)) for b in bookmarks),
+            dtype=np.intp,
+            count=len(bookmarks),
+        )
+        texts = list(positions)
+
         tracker = ProgressTracker(
             total=len(texts), description="Embedding bookmarks", show_progress_bar=False
         )
-        embeddings: List[List[float]] = []
-        for text in texts:
-            vector = self.vector_store.get_embeddings([text])[0]
-            embeddings.append(vector)
-            tracker.update()
+        # Fill one contiguous float32 matrix so the clusterers skip conversion
+        unique_embeddings: Optional[np.ndarray] = None
+        for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            batch = texts[start : start + EMBEDDING_BATCH_SIZE]
+            vectors = np.asarray(
+                self.vector_store.get_cached_embeddings(batch), dtype=np.float32
+            )
+            if unique_embeddings is None:
+                unique_embeddings = np.empty(
+                    (len(texts), vectors.shape[1]), dtype=np.float32
+                )
+            unique_embeddings[start : start + len(batch)] = vectors
+            tracker.update(count=len(batch))
         tracker.finish()
+        if unique_embeddings is None:
+            return []
+        embeddings = unique_embeddings[inverse]
 
         cluster_tracker = ProgressTracker(
             total=1, description="Clustering", show_progress_bar=False
@@ -200,25 +297,37 @@ class CategorySuggester:
         cluster_tracker.update()
         cluster_tracker.finish()
 
-        clusters: dict[int, List[int]] = {}
-        for idx, label in enumerate(labels):
-            if label == -1:
-                continue
-            clusters.setdefault(label, []).append(idx)
-
-        # Sort clusters by size (largest first) and filter for quality
-        sorted_clusters = sorted(
-            clusters.items(), key=lambda x: len(x[1]), reverse=True
-        )
-
-        suggestions: List[CategorySuggestion] = []
-        for cluster_id, indices in sorted_clusters:
+        # Bucket indices by label: the stable sort keeps each cluster's
+        # indices ascending and unique() finds where each cluster starts
+        labels_arr = np.asarray(labels)
+        order = np.argsort(labels_arr, kind="stable")
+        cluster_labels, starts = np.unique(labels_arr[order], return_index=True)
+        clusters = [
+            indices
+            for label, indices in zip(cluster_labels, np.split(order, starts[1:]))
+            if label != -1
+        ]
+
+        # Sort clusters by size (largest first), then by first appearance
+        sorted_clusters = sorted(clusters, key=lambda ix: (-len(ix), ix[0]))
+
+        # Naming style depends only on the collection, not on each cluster
+        style_examples = self._style_examples(bookmarks)
+        sq_norms = np.einsum("ij,ij->i", embeddings, embeddings)
+
+        groups: List[List[Bookmark]] = []
+        for indices in sorted_clusters:
             # Skip clusters that are too small to be meaningful
             if len(indices) < 3:
                 continue
 
-            group = [bookmarks[i] for i in indices]
-            meta = self._generate_cluster_summary(group)
+            # Lead with the bookmarks nearest the centroid so the summary
+            # prompt and the examples shown are typical of the cluster
+            ordered = self._representative_order(embeddings, sq_norms, indices)
+            groups.append([bookmarks[i] for i in ordered])
+
+        suggestions: List[CategorySuggestion] = []
+        for group, meta in self._summarize_clusters(groups, style_examples):
             source_files = sorted({b.source_file for b in group if b.source_file})
 
             # Skip clusters with generic/poor names
@@ -5,12 +5,34 @@ Configuration management for bookmark tools.
 import os
 import yaml  # type: ignore
 import json
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
 import logging
 
+try:
+    from yaml import CSafeLoader as YamlLoader  # type: ignore
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+YAML_EXTENSIONS = frozenset({".yaml", ".yml"})
+
+
+def _is_yaml_path(config_path: str) -> bool:
+    """Check whether a config path should be read and written as YAML."""
+    return os.path.splitext(config_path)[1] in YAML_EXTENSIONS
+
+
+@lru_cache(maxsize=4)
+def _read_config_data(config_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a config file; mtime and size key the cache on file changes."""
+    with open(config_path, "r", encoding="utf-8") as f:
+        if _is_yaml_path(config_path):
+            return yaml.load(f, Loader=YamlLoader)
+        return json.load(f)
+
 
 @dataclass
 class ModelConfig:
@@ -28,6 +50,7 @@ class ProcessingConfig:
     """Processing configuration settings."""
 
     batch_size: int = 50
+    embedding_batch_size: int = 32
     delay_between_requests: float = 0.5
     max_retries: int = 3
     timeout: int = 10
@@ -75,11 +98,12 @@ class BookmarkConfig:
             return cls.default()
 
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                if config_path.endswith(".yaml") or config_path.endswith(".yml"):
-                    data = yaml.safe_load(f)
-                else:
-                    data = json.load(f)
+            # Parsed data is shared between calls; from_dict builds fresh
+            # config objects from it without modifying it
+            stat = os.stat(config_path)
+            data = _read_config_data(
+                os.path.abspath(config_path), stat.st_mtime_ns, stat.st_size
+            )
 
             return cls.from_dict(data)
 
@@ -123,7 +147,7 @@ class BookmarkConfig:
             data = self.to_dict()
 
             with open(config_path, "w", encoding="utf-8") as f:
-                if config_path.endswith(".yaml") or config_path.endswith(".yml"):
+                if _is_yaml_path(config_path):
                     yaml.dump(data, f, default_flow_style=False, indent=2)
                 else:
                     json.dump(data, f, indent=2, ensure_ascii=False)
@@ -148,6 +172,8 @@ class BookmarkConfig:
         # Validate processing
         if self.processing.batch_size <= 0:
             errors.append("Batch size must be positive")
+        if self.processing.embedding_batch_size <= 0:
+            errors.append("Embedding batch size must be positive")
         if self.processing.delay_between_requests < 0:
             errors.append("Delay between requests cannot be negative")
         if self.processing.max_retries < 0:
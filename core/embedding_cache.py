@@ -0,0 +1,170 @@
+"""On-disk cache for embedding vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Vectors kept in memory per cache, so repeated queries skip SQLite entirely
+MEMORY_CACHE_SIZE = 1024
+
+# Entries kept on disk per cache directory before the oldest are evicted
+MAX_CACHE_ENTRIES = 100_000
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lookups
+_LOOKUP_CHUNK_SIZE = 500
+
+
+def default_cache_dir() -> str:
+    """Return the cache directory, honouring BOOKMARKS_CACHE_DIR if set."""
+    return os.environ.get("BOOKMARKS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "bookmarks-local-ai"
+    )
+
+
+class EmbeddingCache:
+    """Store embedding vectors in SQLite keyed by model and text."""
+
+    def __init__(
+        self,
+        model: str,
+        cache_dir: Optional[str] = None,
+        max_entries: int = MAX_CACHE_ENTRIES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            model: Embedding model name; vectors are only reused for the same model
+            cache_dir: Base cache directory (defaults to default_cache_dir())
+            max_entries: Entries kept on disk; the oldest-written are evicted
+                first once the limit is exceeded
+        """
+        self.model = model
+        self.max_entries = max_entries
+        self.directory = cache_dir or default_cache_dir()
+        self.path = os.path.join(self.directory, "embeddings.sqlite3")
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> str:
+        """Return the cache key for a text under this cache's model."""
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the table exists."""
+        if self._connection is None:
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS emb (key TEXT PRIMARY KEY, vec BLOB)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Keep a vector in the in-memory LRU."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached vector for text, or None on a miss."""
+        hits, _ = self.get_many([text])
+        return hits.get(0)
+
+    def put(self, text: str, vector) -> None:
+        """Store a vector for text."""
+        self.put_many([text], [vector], skip_zero=False)
+
+    def get_many(self, texts: Sequence[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up several texts at once.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Tuple of (hits by index into texts, indices of missing texts)
+        """
+        keys = [self._key(text) for text in texts]
+        hits: Dict[int, np.ndarray] = {}
+        with self._lock:
+            wanted = {key for key in keys if key not in self._memory}
+            try:
+                if wanted:
+                    connection = self._connect()
+                    pending = list(wanted)
+                    for start in range(0, len(pending), _LOOKUP_CHUNK_SIZE):
+                        chunk = pending[start : start + _LOOKUP_CHUNK_SIZE]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows = connection.execute(
+                            f"SELECT key, vec FROM emb WHERE key IN ({placeholders})",
+                            chunk,
+                        )
+                        for key, blob in rows:
+                            self._remember(key, np.frombuffer(blob, dtype=np.float32))
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Ignoring unreadable embedding cache {self.path}: {e}")
+
+            misses: List[int] = []
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    misses.append(i)
+                else:
+                    self._memory.move_to_end(key)
+                    hits[i] = vector
+        return hits, misses
+
+    def put_many(
+        self, texts: Sequence[str], vectors: Sequence, skip_zero: bool = True
+    ) -> None:
+        """Store vectors for texts, skipping all-zero failure fallbacks."""
+        rows = []
+        for text, vector in zip(texts, vectors):
+            if skip_zero and not any(vector):
+                continue
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((self._key(text), array))
+        if not rows:
+            return
+
+        with self._lock:
+            for key, array in rows:
+                self._remember(key, array)
+            try:
+                connection = self._connect()
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO emb (key, vec) VALUES (?, ?)",
+                        [(key, array.tobytes()) for key, array in rows],
+                    )
+                    # Replaced rows get a new rowid, so rowid order is write order
+                    (count,) = connection.execute("SELECT COUNT(*) FROM emb").fetchone()
+                    if count > self.max_entries:
+                        connection.execute(
+                            "DELETE FROM emb WHERE rowid IN "
+                            "(SELECT rowid FROM emb ORDER BY rowid LIMIT ?)",
+                            (count - self.max_entries,),
+                        )
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Could not write embedding cache entry: {e}")
@@ -5,16 +5,14 @@ from __future__ import annotations
 import json
 import logging
 import os
-import time
-from typing import List, Optional
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 
-import ollama
 import requests  # type: ignore
-from bs4 import BeautifulSoup
 
 from .bookmark_loader import BookmarkLoader
-from .models import Bookmark
-from .vector_store import VectorStore
+from .models import Bookmark, SearchResult
+from .vector_store import VectorStore, collection_name_for, default_persist_dir
 from .web_extractor import WebExtractor
 from .spinner import Spinner
 
@@ -24,18 +22,52 @@ logger = logging.getLogger(__name__)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("ollama").setLevel(logging.WARNING)
 
+# Entries kept per summary message list; totals are always exact
+SUMMARY_MAX_ENTRIES = 1000
+
+# Generation cap for the description/tags JSON
+ENRICHMENT_MAX_TOKENS = 200
+
+# Prefix for the per-input enrichment context collections
+ENRICHER_COLLECTION = "bookmarks_enricher"
+
+
+class BoundedLog:
+    """Message list that counts every entry but only keeps the newest ones."""
+
+    def __init__(self, maxlen: int = SUMMARY_MAX_ENTRIES) -> None:
+        self._entries: Deque[str] = deque(maxlen=maxlen)
+        self.total = 0
+
+    def append(self, message: str) -> None:
+        """Record a message, dropping the oldest kept one when full."""
+        self._entries.append(message)
+        self.total += 1
+
+    @property
+    def omitted(self) -> int:
+        """Number of messages counted but no longer kept."""
+        return self.total - len(self._entries)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
 
 class ProcessingSummary:
     """Tracks warnings, errors, and statistics during processing."""
 
     def __init__(self) -> None:
-        self.warnings: List[str] = []
-        self.errors: List[str] = []
-        self.skipped_no_url: List[str] = []
-        self.web_extraction_failures: List[str] = []
-        self.enrichment_failures: List[str] = []
-        self.successful_enrichments: List[str] = []
-        self.already_enriched: List[str] = []
+        self.warnings = BoundedLog()
+        self.errors = BoundedLog()
+        self.skipped_no_url = BoundedLog()
+        self.web_extraction_failures = BoundedLog()
+        self.enrichment_failures = BoundedLog()
+        # Successes are only ever reported as totals
+        self.successful_enrichments_count = 0
+        self.already_enriched_count = 0
 
     def add_warning(self, message: str) -> None:
         """Add a warning message."""
@@ -59,11 +91,19 @@ class ProcessingSummary:
 
     def add_successful_enrichment(self, title: str) -> None:
         """Track successful enrichment."""
-        self.successful_enrichments.append(title)
+        self.successful_enrichments_count += 1
 
     def add_already_enriched(self, title: str) -> None:
         """Track already enriched bookmark."""
-        self.already_enriched.append(title)
+        self.already_enriched_count += 1
+
+    @staticmethod
+    def _print_entries(log: BoundedLog) -> None:
+        """Print a numbered list of the entries a log still keeps."""
+        if log.omitted:
+            print(f"   ... {log.omitted} earlier entries not kept")
+        for i, entry in enumerate(log, log.omitted + 1):
+            print(f"   {i}. {entry}")
 
     def print_summary(self) -> None:
         """Print a comprehensive summary of the processing."""
@@ -72,46 +112,41 @@ class ProcessingSummary:
         print("=" * 80)
 
         total_processed = (
-            len(self.successful_enrichments)
-            + len(self.already_enriched)
+            self.successful_enrichments_count
+            + self.already_enriched_count
             + len(self.enrichment_failures)
             + len(self.skipped_no_url)
         )
 
         print("📊 STATISTICS:")
         print(f"   Total bookmarks processed: {total_processed}")
-        print(f"   ✅ Successfully enriched: {len(self.successful_enrichments)}")
-        print(f"   ✓  Already enriched: {len(self.already_enriched)}")
+        print(f"   ✅ Successfully enriched: {self.successful_enrichments_count}")
+        print(f"   ✓  Already enriched: {self.already_enriched_count}")
         print(f"   ❌ Failed to enrich: {len(self.enrichment_failures)}")
         print(f"   ⚠️  Skipped (no URL): {len(self.skipped_no_url)}")
         print(f"   🌐 Web extraction failures: {len(self.web_extraction_failures)}")
 
         if self.errors:
             print(f"\n🚨 ERRORS ({len(self.errors)}) - Require immediate attention:")
-            for i, error in enumerate(self.errors, 1):
-                print(f"   {i}. {error}")
+            self._print_entries(self.errors)
 
         if self.warnings:
             print(f"\n⚠️  WARNINGS ({len(self.warnings)}) - May need attention:")
-            for i, warning in enumerate(self.warnings, 1):
-                print(f"   {i}. {warning}")
+            self._print_entries(self.warnings)
 
         if self.skipped_no_url:
             print(f"\n🔗 BOOKMARKS SKIPPED (No URL) ({len(self.skipped_no_url)}):")
-            for i, title in enumerate(self.skipped_no_url, 1):
-                print(f"   {i}. {title}")
+            self._print_entries(self.skipped_no_url)
 
         if self.web_extraction_failures:
             print(
                 f"\n🌐 WEB EXTRACTION FAILURES ({len(self.web_extraction_failures)}):"
             )
-            for i, failure in enumerate(self.web_extraction_failures, 1):
-                print(f"   {i}. {failure}")
+            self._print_entries(self.web_extraction_failures)
 
         if self.enrichment_failures:
             print(f"\n🤖 ENRICHMENT FAILURES ({len(self.enrichment_failures)}):")
-            for i, failure in enumerate(self.enrichment_failures, 1):
-                print(f"   {i}. {failure}")
+            self._print_entries(self.enrichment_failures)
 
         total_issues = (
             len(self.errors)
@@ -122,9 +157,9 @@ class ProcessingSummary:
 
         if total_issues == 0:
             print("\n🎉 SUCCESS: All bookmarks processed without issues!")
-        elif len(self.successful_enrichments) > 0:
+        elif self.successful_enrichments_count > 0:
             print(
-                f"\n✨ PARTIAL SUCCESS: {len(self.successful_enrichments)} "
+                f"\n✨ PARTIAL SUCCESS: {self.successful_enrichments_count} "
                 "bookmarks enriched"
             )
             if len(self.web_extraction_failures) > 0:
@@ -141,17 +176,23 @@ class ProcessingSummary:
 class SummaryAwareWebExtractor(WebExtractor):
     """Web extractor that reports failures to ProcessingSummary."""
 
-    def __init__(self, summary: ProcessingSummary, timeout: int = 10) -> None:
-        super().__init__(timeout)
+    def __init__(
+        self,
+        summary: ProcessingSummary,
+        timeout: int = 10,
+        min_interval: float = 0.5,
+    ) -> None:
+        super().__init__(timeout, min_interval=min_interval)
         self.summary = summary
 
     def extract_content(self, url: str) -> tuple[str, str]:
         """Extract content and track failures in summary."""
         try:
-            response = requests.get(url, timeout=self.timeout, headers=self.headers)
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = self._parse_html(response.content)
 
             title = self._extract_title(soup)
             description = self._extract_description(soup)
@@ -183,6 +224,7 @@ class BookmarkEnricher:
         ollama_url: str = "http://localhost:11434",
         embedding_model: str = "nomic-embed-text",
         llm_model: str = "llama3.1:8b",
+        embedding_batch_size: int = 32,
     ) -> None:
         self.ollama_url = ollama_url
         self.embedding_model = embedding_model
@@ -191,32 +233,55 @@ class BookmarkEnricher:
 
         self.loader = BookmarkLoader()
         self.vector_store = VectorStore(
-            collection_name="bookmarks_enricher",
+            collection_name=ENRICHER_COLLECTION,
             ollama_url=ollama_url,
             embedding_model=embedding_model,
+            embedding_batch_size=embedding_batch_size,
+            persist_dir=default_persist_dir(),
         )
+        self.ollama_client = self.vector_store.ollama_client
         self.web_extractor = SummaryAwareWebExtractor(self.summary)
+        self._prefetched_web: Dict[str, Tuple[str, str]] = {}
+        self._prefetched_search: Dict[str, SearchResult] = {}
 
         logger.info(f"Initialized enricher with {embedding_model} and {llm_model}")
 
-    def enrich_bookmark(self, bookmark: Bookmark) -> Bookmark:
-        """Enrich a single bookmark with description and tags."""
-        if not bookmark.url:
-            logger.warning(f"Skipping bookmark without URL: {bookmark.title}")
-            self.summary.add_skipped_no_url(bookmark.title)
-            return bookmark
+    def close(self) -> None:
+        """Release network connections held by the web extractor."""
+        self.web_extractor.close()
+
+    @staticmethod
+    def _needs_web_content(bookmark: Bookmark) -> bool:
+        """Check whether enrich_bookmark will fetch the bookmark's page."""
+        return (
+            bool(bookmark.url)
+            and not bookmark.is_enriched
+            and (not bookmark.title or not bookmark.content_text)
+        )
 
-        if bookmark.is_enriched:
-            logger.info(f"Skipping already enriched bookmark: {bookmark.title}")
-            self.summary.add_already_enriched(bookmark.title)
-            return bookmark
+    def _prefetch_web_content(self, bookmarks: List[Bookmark]) -> None:
+        """Fetch the pages enrich_bookmark will need, concurrently."""
+        urls = list(
+            dict.fromkeys(b.url for b in bookmarks if self._needs_web_content(b))
+        )
+        if not urls:
+            return
 
-        logger.info(f"Enriching bookmark: {bookmark.title}")
+        with Spinner(f"Fetching {len(urls)} web pages..."):
+            results = self.web_extractor.extract_many(urls)
+            self._prefetched_web.update(zip(urls, results))
+
+    def _fetch_web(self, url: str) -> Tuple[str, str]:
+        """Return prefetched page content, fetching it if it wasn't."""
+        content = self._prefetched_web.get(url)
+        if content is None:
+            content = self.web_extractor.extract_content(url)
+        return content
 
+    def _apply_web_content(self, bookmark: Bookmark) -> None:
+        """Fill a missing title or content from the bookmark's web page."""
         if not bookmark.title or not bookmark.content_text:
-            web_title, web_description = self.web_extractor.extract_content(
-                bookmark.url
-            )
+            web_title, web_description = self._fetch_web(bookmark.url)
 
             if not bookmark.title and web_title:
                 bookmark.title = web_title
@@ -227,8 +292,44 @@ class BookmarkEnricher:
                 else:
                     bookmark.excerpt = web_description
 
+    @staticmethod
+    def _similarity_query(bookmark: Bookmark) -> str:
+        """Build the vector store query used to find enrichment context."""
         query_parts = [bookmark.title, bookmark.content_text]
-        query = " ".join(filter(None, query_parts))
+        return " ".join(filter(None, query_parts))
+
+    def _prefetch_similar(self, bookmarks: List[Bookmark]) -> None:
+        """Look up enrichment context for all bookmarks in one batched search."""
+        queries: Dict[str, None] = {}
+        for bookmark in bookmarks:
+            if not bookmark.url or bookmark.is_enriched:
+                continue
+            self._apply_web_content(bookmark)
+            query = self._similarity_query(bookmark)
+            if query:
+                queries[query] = None
+        if not queries:
+            return
+
+        results = self.vector_store.search_batch(list(queries), n_results=3)
+        self._prefetched_search.update(zip(queries, results))
+
+    def enrich_bookmark(self, bookmark: Bookmark) -> Bookmark:
+        """Enrich a single bookmark with description and tags."""
+        if not bookmark.url:
+            logger.warning(f"Skipping bookmark without URL: {bookmark.title}")
+            self.summary.add_skipped_no_url(bookmark.title)
+            return bookmark
+
+        if bookmark.is_enriched:
+            logger.info(f"Skipping already enriched bookmark: {bookmark.title}")
+            self.summary.add_already_enriched(bookmark.title)
+            return bookmark
+
+        logger.info(f"Enriching bookmark: {bookmark.title}")
+
+        self._apply_web_content(bookmark)
+        query = self._similarity_query(bookmark)
 
         if not query:
             logger.warning(f"No content to query for bookmark: {bookmark.url}")
@@ -238,7 +339,9 @@ class BookmarkEnricher:
             return bookmark
 
         try:
-            search_result = self.vector_store.search(query, n_results=3)
+            search_result = self._prefetched_search.get(query)
+            if search_result is None:
+                search_result = self.vector_store.search(query, n_results=3)
         except Exception as e:  # noqa: BLE001
             self.summary.add_error(
                 f"Vector search failed for {bookmark.title}: {str(e)}"
@@ -293,20 +396,23 @@ class BookmarkEnricher:
         )
         with Spinner(f"Generating enrichment for {bookmark.title}..."):
             try:
-                response = ollama.generate(
+                response = self.ollama_client.generate(
                     model=self.llm_model,
                     prompt=prompt,
-                    options={"temperature": 0.3},
+                    format="json",
+                    options={
+                        "temperature": 0.3,
+                        "num_predict": ENRICHMENT_MAX_TOKENS,
+                    },
                 )
 
-                response_text = response["response"].strip()
-
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-
-                if json_start != -1 and json_end > json_start:
-                    json_text = response_text[json_start:json_end]
-                    return json.loads(json_text)
+                # format="json" constrains the model to emit a bare JSON value
+                try:
+                    result = json.loads(response["response"])
+                except json.JSONDecodeError:
+                    result = None
+                if isinstance(result, dict):
+                    return result
                 logger.warning(
                     f"Could not parse JSON from response for {bookmark.title}"
                 )
@@ -334,6 +440,9 @@ class BookmarkEnricher:
             self.summary.print_summary()
             return
 
+        self.vector_store.use_collection(
+            collection_name_for(ENRICHER_COLLECTION, input_file)
+        )
         self._process_bookmarks(bookmarks, limit=limit)
 
         if output_file is None:
@@ -365,6 +474,9 @@ class BookmarkEnricher:
             f"Loaded {stats['total']} bookmarks ({stats['enriched']} already enriched)"
         )
 
+        self.vector_store.use_collection(
+            collection_name_for(ENRICHER_COLLECTION, directory_path)
+        )
         self._process_bookmarks(all_bookmarks, limit=limit)
 
         if self.loader.save_by_source_file(all_bookmarks, directory_path):
@@ -378,22 +490,28 @@ class BookmarkEnricher:
         self, bookmarks: List[Bookmark], limit: Optional[int] = None
     ) -> None:
         """Process a list of bookmarks (shared logic)."""
-        enriched_bookmarks = self.loader.filter_enriched(bookmarks)
-        if enriched_bookmarks:
-            with Spinner(
-                f"Building vector store from {len(enriched_bookmarks)} bookmarks..."
-            ):
-                try:
-                    self.vector_store.rebuild_from_bookmarks(enriched_bookmarks)
-                except Exception as e:  # noqa: BLE001
-                    self.summary.add_error(f"Failed to build vector store: {str(e)}")
-                    return
+        enriched_bookmarks, unenriched_bookmarks = self.loader.partition_enriched(
+            bookmarks
+        )
+        # Sync even when nothing is enriched yet, so vectors left over from an
+        # earlier run are dropped rather than offered as similar bookmarks
+        with Spinner(
+            f"Updating vector store from {len(enriched_bookmarks)} bookmarks..."
+        ):
+            try:
+                # Only new or changed bookmarks are re-embedded
+                self.vector_store.sync_bookmarks(enriched_bookmarks)
+            except Exception as e:  # noqa: BLE001
+                self.summary.add_error(f"Failed to build vector store: {str(e)}")
+                return
 
-        unenriched_bookmarks = self.loader.filter_unenriched(bookmarks)
         if limit is not None and limit > 0:
             unenriched_bookmarks = unenriched_bookmarks[:limit]
         logger.info(f"Starting enrichment of {len(unenriched_bookmarks)} bookmarks...")
 
+        self._prefetch_web_content(unenriched_bookmarks)
+        self._prefetch_similar(unenriched_bookmarks)
+
         for i, bookmark in enumerate(unenriched_bookmarks):
             logger.info(
                 f"Processing bookmark {i+1}/{len(unenriched_bookmarks)} "
@@ -407,7 +525,8 @@ class BookmarkEnricher:
                     f"Unexpected error processing {bookmark.title}: {str(e)}"
                 )
 
-            time.sleep(0.5)
+        self._prefetched_web.clear()
+        self._prefetched_search.clear()
 
-        success_count = len(self.summary.successful_enrichments)
+        success_count = self.summary.successful_enrichments_count
         logger.info(f"Enrichment complete! Processed {success_count} bookmarks")
@@ -5,10 +5,20 @@ from __future__ import annotations
 import logging
 import os
 
+_configured = False
+
 
 def configure_chromadb_env() -> None:
-    """Configure environment variables and logging for ChromaDB."""
+    """Configure environment variables and logging for ChromaDB.
+
+    Safe to call repeatedly; only the first call has any effect.
+    """
+    global _configured
+    if _configured:
+        return
+
     os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
     os.environ.setdefault("CHROMA_SERVER_NOFILE", "1")
     logging.getLogger("chromadb.telemetry.posthog").setLevel(logging.CRITICAL)
     logging.getLogger("chromadb.telemetry.product.posthog").setLevel(logging.CRITICAL)
+    _configured = True
@@ -5,14 +5,79 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import List
-from bs4.element import Tag
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from lxml import etree  # type: ignore
 
 from .bookmark_loader import BookmarkLoader
 from .models import Bookmark
-from .web_extractor import WebExtractor
+from .web_extractor import WEB_FETCH_WORKERS, WebExtractor
 from .intelligence import BookmarkIntelligence
 
+try:
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    _json_loads = json.loads
+
+T = TypeVar("T")
+
+# Formats are sniffed on every imported file, so compile the patterns once
+_JSON_START_PATTERN = re.compile(r"\s*[\[{]")
+_HTML_ANCHOR_PATTERN = re.compile(r"<a ", re.IGNORECASE)
+_MD_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\((https?://[^)]+)\)")
+# Plain URL lists: any non-blank line not starting with "http" rules the
+# format out; otherwise every stripped non-blank line is a URL
+_NON_URL_LINE_PATTERN = re.compile(r"^[^\S\n]*(?!http)\S", re.MULTILINE)
+_URL_LINE_PATTERN = re.compile(r"^[^\S\n]*(http[^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+# Bytes of an HTML export handed to the parser at a time
+_HTML_READ_SIZE = 64 * 1024
+
+
+class _AnchorCollector:
+    """lxml parser target turning <a href> elements into bookmarks.
+
+    Netscape exports never close <DT>, which makes libxml2 nest every entry
+    one level deeper; a tree-building parser stops at its depth limit after
+    about 250 bookmarks, but parser events are not affected.
+    """
+
+    def __init__(self) -> None:
+        self.bookmarks: List[Bookmark] = []
+        self._anchor: Optional[Dict[str, str]] = None
+        self._text: List[str] = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == "a":
+            self._anchor = dict(attrib)
+            self._text = []
+
+    def data(self, text: str) -> None:
+        if self._anchor is not None:
+            self._text.append(text)
+
+    def end(self, tag: str) -> None:
+        if tag != "a" or self._anchor is None:
+            return
+        href = self._anchor.get("href")
+        if href:
+            tags_attr = self._anchor.get("tags") or self._anchor.get("data-tags")
+            self.bookmarks.append(
+                Bookmark(
+                    url=href,
+                    title="".join(self._text).strip(),
+                    tags=tags_attr.split(",") if tags_attr else [],
+                )
+            )
+        self._anchor = None
+
+    def close(self) -> List[Bookmark]:
+        return self.bookmarks
+
 
 class BookmarkImporter:
     """Import new bookmarks into an existing collection."""
@@ -32,44 +97,50 @@ class BookmarkImporter:
         with open(file_path, "r", encoding="utf-8") as f:
             raw = f.read()
 
-        try:
-            data = json.loads(raw)
-            if isinstance(data, list):
-                return [Bookmark.from_dict(b) for b in data]
-        except Exception:  # noqa: BLE001
-            pass
-
-        raw_lower = raw.lower()
+        # Only text that looks like JSON is worth a full decode attempt
+        if _JSON_START_PATTERN.match(raw):
+            try:
+                data = _json_loads(raw)
+                if isinstance(data, list):
+                    return [Bookmark.from_dict(b) for b in data]
+            except Exception:  # noqa: BLE001
+                pass
 
-        if "<a " in raw_lower:
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(raw, "html.parser")
-            bookmarks = []
-            for a in soup.find_all("a"):
-                if not isinstance(a, Tag):
-                    continue
-                href = a.get("href")
-                if not href:
-                    continue
-                title = a.text.strip()
-                tags_attr = a.get("tags") or a.get("data-tags")
-                tags = str(tags_attr).split(",") if tags_attr else []
-                bookmarks.append(Bookmark(url=str(href), title=title, tags=tags))
+        if _HTML_ANCHOR_PATTERN.search(raw):
+            bookmarks = self._parse_html_anchors(file_path)
             if bookmarks:
                 return bookmarks
 
-        md_pattern = re.compile(r"\[([^\]]+)\]\((https?://[^)]+)\)")
-        matches = md_pattern.findall(raw)
+        matches = _MD_LINK_PATTERN.findall(raw)
         if matches:
             return [Bookmark(url=url, title=title) for title, url in matches]
 
-        url_lines = [line.strip() for line in raw.splitlines() if line.strip()]
-        if all(line.startswith("http") for line in url_lines):
-            return [Bookmark(url=line) for line in url_lines]
+        if not _NON_URL_LINE_PATTERN.search(raw):
+            return [Bookmark(url=url) for url in _URL_LINE_PATTERN.findall(raw)]
 
         raise ValueError("Unrecognized bookmark format")
 
+    @staticmethod
+    def _parse_html_anchors(file_path: str) -> List[Bookmark]:
+        """Stream <a href> elements out of an HTML export such as Netscape's.
+
+        The file is fed to lxml in chunks and no tree is built, so memory
+        stays flat however large the export.
+        """
+        parser = etree.HTMLParser(target=_AnchorCollector(), encoding="utf-8")
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_HTML_READ_SIZE), b""):
+                parser.feed(chunk)
+        return parser.close()
+
+    @staticmethod
+    def _map_urls(func: Callable[[str], T], urls: List[str]) -> List[T]:
+        """Apply a network-bound function to URLs concurrently, keeping order."""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(WEB_FETCH_WORKERS, len(urls))) as pool:
+            return list(pool.map(func, urls))
+
     def import_from_file(
         self, new_bookmarks_file: str, check_duplicates: bool = True
     ) -> tuple[List[str], List[str]]:
@@ -79,21 +150,49 @@ class BookmarkImporter:
         dead_links: List[str] = []
         skipped_duplicates: List[str] = []
 
-        for bm in bookmarks:
-            if not self.web_extractor.is_valid_url(bm.url):
+        valid_bookmarks: List[Bookmark] = []
+        reachable = self._map_urls(
+            self.web_extractor.is_valid_url, [bm.url for bm in bookmarks]
+        )
+        for bm, is_reachable in zip(bookmarks, reachable):
+            if is_reachable:
+                valid_bookmarks.append(bm)
+            else:
                 dead_links.append(bm.url)
-                continue
 
-            if check_duplicates:
-                duplicate = self.intelligence.is_duplicate(bm)
-                if duplicate:
-                    skipped_duplicates.append(
-                        f"{bm.url} (duplicate of existing bookmark: {duplicate.title})"
-                    )
-                    continue
+        # One batched vector search for the whole file; exact matches against
+        # bookmarks imported earlier in this run are still checked per item
+        known_duplicates: List[Optional[Bookmark]] = (
+            self.intelligence.is_duplicate_batch(valid_bookmarks)
+            if check_duplicates
+            else [None] * len(valid_bookmarks)
+        )
+
+        # Fetch missing titles and descriptions for likely imports up front
+        fetch_urls = list(
+            dict.fromkeys(
+                bm.url
+                for bm, duplicate in zip(valid_bookmarks, known_duplicates)
+                if duplicate is None and (not bm.title or not bm.description)
+            )
+        )
+        fetched: Dict[str, Tuple[str, str]] = dict(
+            zip(
+                fetch_urls,
+                self.web_extractor.extract_many(fetch_urls),
+            )
+        )
+
+        candidates: List[Bookmark] = []
+        for bm, duplicate in zip(valid_bookmarks, known_duplicates):
+            if duplicate:
+                skipped_duplicates.append(
+                    f"{bm.url} (duplicate of existing bookmark: {duplicate.title})"
+                )
+                continue
 
             if not bm.title or not bm.description:
-                title, desc = self.web_extractor.extract_content(bm.url)
+                title, desc = fetched[bm.url]
                 if not bm.title:
                     bm.title = title
                 if not bm.description:
@@ -104,26 +203,50 @@ class BookmarkImporter:
                 if domain:
                     bm.tags = [domain]
 
-            suggestions = self.intelligence.suggest_categorization(bm, 1)
+            candidates.append(bm)
+
+        # Suggest before adding anything to the collection, so indexing it
+        # can't pick up the new bookmarks as their own nearest neighbours
+        all_suggestions = self.intelligence.suggest_categorization_batch(candidates, 1)
+
+        # New bookmarks per target file, written once each below
+        pending_by_path: Dict[str, List[Bookmark]] = defaultdict(list)
+        collection_is_dir = os.path.isdir(self.collection_path)
+        accepted: List[Bookmark] = []
+        for bm, suggestions in zip(candidates, all_suggestions):
+            # Exact matches against bookmarks accepted earlier in this run
+            if check_duplicates:
+                duplicate = self.intelligence.find_exact_duplicate(bm)
+                if duplicate:
+                    skipped_duplicates.append(
+                        f"{bm.url} (duplicate of existing bookmark: {duplicate.title})"
+                    )
+                    continue
+
             filename = "uncategorized.json"
             if suggestions:
                 filename = suggestions[0][0]
 
             target_path = (
                 os.path.join(self.collection_path, filename)
-                if os.path.isdir(self.collection_path)
+                if collection_is_dir
                 else self.collection_path
             )
 
+            bm.source_file = os.path.basename(target_path)
+            pending_by_path[target_path].append(bm)
+            accepted.append(bm)
+            self.intelligence.add_bookmark(bm)
+
+        for target_path, new_bookmarks in pending_by_path.items():
             existing = []
             if os.path.exists(target_path):
                 existing = self.loader.load_from_file(target_path)
-
-            bm.source_file = os.path.basename(target_path)
-            existing.append(bm)
+            existing.extend(new_bookmarks)
             self.loader.save_to_file(existing, target_path)
 
-            self.intelligence.bookmarks.append(bm)
+        # Embed only the imported bookmarks into any vector index already built
+        self.intelligence.index_new_bookmarks(accepted)
 
         return dead_links, skipped_duplicates
 
@@ -5,11 +5,13 @@ from __future__ import annotations
 import logging
 import os
 from collections import Counter, defaultdict
+from heapq import nlargest
+from operator import itemgetter
 from typing import Dict, List, Optional, Tuple
 
 from .bookmark_loader import BookmarkLoader
 from .models import Bookmark, DuplicateGroup, SearchResult
-from .vector_store import VectorStore
+from .vector_store import VectorStore, collection_name_for, default_persist_dir
 from .web_extractor import WebExtractor
 from .spinner import Spinner
 from .category_manager import CategoryManager
@@ -19,6 +21,13 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# Prefix for the per-input search collections
+INTELLIGENCE_COLLECTION = "bookmarks_intelligence"
+
+# Nearest hits checked per duplicate query, so a bookmark removed since the
+# last sync does not hide the next-closest match
+DUPLICATE_CANDIDATES = 3
+
 
 class BookmarkIntelligence:
     """Smart analysis and search for bookmark collections."""
@@ -27,24 +36,99 @@ class BookmarkIntelligence:
         self,
         ollama_url: str = "http://localhost:11434",
         embedding_model: str = "nomic-embed-text",
+        embedding_batch_size: int = 32,
     ) -> None:
         self.ollama_url = ollama_url
         self.embedding_model = embedding_model
 
         self.loader = BookmarkLoader()
         self.vector_store = VectorStore(
-            collection_name="bookmarks_intelligence",
+            collection_name=INTELLIGENCE_COLLECTION,
             ollama_url=ollama_url,
             embedding_model=embedding_model,
+            embedding_batch_size=embedding_batch_size,
+            persist_dir=default_persist_dir(),
         )
         self.category_manager = CategoryManager(self.vector_store, self.loader)
+        self.web_extractor = WebExtractor()
 
-        self.bookmarks: List[Bookmark] = []
+        self._bookmarks: List[Bookmark] = []
+        # Exact-match lookups for is_duplicate, built lazily from bookmarks
+        self._url_index: Optional[Dict[str, Bookmark]] = None
+        self._title_index: Optional[Dict[str, Bookmark]] = None
         self.indexed = False
         self.input_path: Optional[str] = None
 
         logger.info(f"Initialized BookmarkIntelligence with {embedding_model}")
 
+    @property
+    def bookmarks(self) -> List[Bookmark]:
+        """Loaded bookmarks."""
+        return self._bookmarks
+
+    @bookmarks.setter
+    def bookmarks(self, bookmarks: List[Bookmark]) -> None:
+        self._bookmarks = bookmarks
+        self._invalidate_lookup()
+
+    def _invalidate_lookup(self) -> None:
+        """Drop the lookup indexes and mark the vector store stale."""
+        self._url_index = None
+        self._title_index = None
+        self.indexed = False
+
+    def _lookup_indexes(self) -> Tuple[Dict[str, Bookmark], Dict[str, Bookmark]]:
+        """Return the URL and normalized-title indexes, building them if needed."""
+        if self._url_index is None or self._title_index is None:
+            self._url_index = {}
+            self._title_index = {}
+            for bookmark in self._bookmarks:
+                self._index_bookmark(bookmark)
+        return self._url_index, self._title_index
+
+    def _index_bookmark(self, bookmark: Bookmark) -> None:
+        """Add a bookmark to the built indexes, keeping the first match."""
+        if self._url_index is None or self._title_index is None:
+            return
+        if bookmark.url:
+            self._url_index.setdefault(bookmark.url, bookmark)
+        if bookmark.title:
+            self._title_index.setdefault(bookmark.normalized_title, bookmark)
+
+    def add_bookmark(self, bookmark: Bookmark) -> None:
+        """Append a bookmark to the collection and its duplicate indexes."""
+        self._bookmarks.append(bookmark)
+        self._index_bookmark(bookmark)
+
+    def remove_bookmarks(self, bookmarks: List[Bookmark]) -> None:
+        """Remove bookmarks, matched by identity, from the collection.
+
+        The exact-match indexes keep the first bookmark per key, so they are
+        rebuilt on next use. Similarity hits are mapped back through the URL
+        index, so removed bookmarks stop matching at once; the vector store
+        drops them on its next sync.
+        """
+        removed_ids = {id(b) for b in bookmarks}
+        if not removed_ids:
+            return
+
+        self._bookmarks[:] = [b for b in self._bookmarks if id(b) not in removed_ids]
+        self._url_index = None
+        self._title_index = None
+        self.indexed = False
+
+    def index_new_bookmarks(self, bookmarks: List[Bookmark]) -> None:
+        """Add bookmarks already appended with add_bookmark to the vector store.
+
+        Only the new bookmarks are embedded. If the store has not been indexed
+        yet, it will include them when it is.
+        """
+        if not bookmarks:
+            return
+
+        if self.indexed and not self.vector_store.add_bookmarks(bookmarks):
+            logger.warning("Failed to add new bookmarks to the vector store")
+
     def load_bookmarks(self, path: str) -> bool:
         """Load bookmarks from file or directory."""
         try:
@@ -57,6 +141,12 @@ class BookmarkIntelligence:
                 return False
 
             self.input_path = path
+            # Each input gets its own persisted collection, so search never
+            # returns bookmarks from a different file or directory
+            self.vector_store.use_collection(
+                collection_name_for(INTELLIGENCE_COLLECTION, path)
+            )
+            self.indexed = False
             logger.info(f"Loaded {len(self.bookmarks)} bookmarks")
             return True
 
@@ -66,7 +156,8 @@ class BookmarkIntelligence:
 
     def _ensure_indexed(self) -> bool:
         """Ensure bookmarks are indexed in vector store."""
-        if not self.indexed and self.bookmarks:
+        # An empty list still syncs, clearing vectors left from earlier runs
+        if not self.indexed:
             with Spinner("Indexing bookmarks..."):
                 if not self.vector_store.rebuild_from_bookmarks(self.bookmarks):
                     logger.error("Failed to index bookmarks")
@@ -94,12 +185,17 @@ class BookmarkIntelligence:
             duplicates: List[DuplicateGroup] = []
 
             url_groups: dict[str, list[Bookmark]] = defaultdict(list)
+            title_groups: dict[str, list[Bookmark]] = defaultdict(list)
             for bookmark in self.bookmarks:
                 if bookmark.url:
                     url_groups[bookmark.url].append(bookmark)
+                if bookmark.title:
+                    title_groups[bookmark.normalized_title].append(bookmark)
 
+            processed_urls: set[str] = set()
             for url, bookmarks in url_groups.items():
                 if len(bookmarks) > 1:
+                    processed_urls.add(url)
                     duplicates.append(
                         DuplicateGroup(
                             bookmarks=bookmarks,
@@ -108,13 +204,6 @@ class BookmarkIntelligence:
                         )
                     )
 
-            title_groups: dict[str, list[Bookmark]] = defaultdict(list)
-            for bookmark in self.bookmarks:
-                if bookmark.title:
-                    normalized_title = bookmark.title.lower().strip()
-                    title_groups[normalized_title].append(bookmark)
-
-            processed_urls = {b.url for group in duplicates for b in group.bookmarks}
             for title, bookmarks in title_groups.items():
                 if len(bookmarks) > 1:
                     unique_bookmarks = [
@@ -131,43 +220,97 @@ class BookmarkIntelligence:
 
         return duplicates
 
+    def find_exact_duplicate(self, new_bookmark: Bookmark) -> Optional[Bookmark]:
+        """Return a bookmark with the same URL or normalized title, if any."""
+        url_index, title_index = self._lookup_indexes()
+
+        if new_bookmark.url and new_bookmark.url in url_index:
+            return url_index[new_bookmark.url]
+
+        if new_bookmark.title:
+            return title_index.get(new_bookmark.normalized_title)
+
+        return None
+
+    def _nearest_bookmarks(
+        self, queries: List[str], similarity_threshold: float
+    ) -> List[Optional[Bookmark]]:
+        """Return the closest bookmark for each query if it clears the threshold.
+
+        All queries go to the vector store's index in one search, so no copy
+        of the collection's embeddings is held here. Hits are mapped back to
+        loaded bookmarks by URL, skipping any that are no longer loaded.
+        """
+        results = self.vector_store.search_batch(
+            queries, n_results=DUPLICATE_CANDIDATES
+        )
+        url_index, _ = self._lookup_indexes()
+        matches: List[Optional[Bookmark]] = []
+        for result in results:
+            match = None
+            for similar in result.similar_bookmarks:
+                if similar.similarity_score < similarity_threshold:
+                    break
+                match = url_index.get(similar.bookmark.url)
+                if match is not None:
+                    break
+            matches.append(match)
+        return matches
+
+    @staticmethod
+    def _similarity_query(bookmark: Bookmark) -> str:
+        """Text used for the vector similarity check, or "" to skip it."""
+        return bookmark.query_text if bookmark.description else ""
+
     def is_duplicate(
         self, new_bookmark: Bookmark, similarity_threshold: float = 0.85
     ) -> Optional[Bookmark]:
         """Check if a single bookmark is a duplicate."""
-        for bookmark in self.bookmarks:
-            if bookmark.url and new_bookmark.url and bookmark.url == new_bookmark.url:
-                return bookmark
+        match = self.find_exact_duplicate(new_bookmark)
+        if match is not None:
+            return match
 
-        if new_bookmark.title:
-            normalized_new_title = new_bookmark.title.lower().strip()
-            for bookmark in self.bookmarks:
-                if bookmark.title:
-                    normalized_title = bookmark.title.lower().strip()
-                    if normalized_new_title == normalized_title:
-                        return bookmark
+        search_content = self._similarity_query(new_bookmark)
+        if search_content and self._ensure_indexed():
+            try:
+                return self._nearest_bookmarks([search_content], similarity_threshold)[
+                    0
+                ]
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Vector similarity check failed: {e}")
+
+        return None
 
-        if self._ensure_indexed() and new_bookmark.description:
+    def is_duplicate_batch(
+        self, new_bookmarks: List[Bookmark], similarity_threshold: float = 0.85
+    ) -> List[Optional[Bookmark]]:
+        """Check several bookmarks for duplicates with one vector search.
+
+        Args:
+            new_bookmarks: Bookmarks to check against the collection
+            similarity_threshold: Minimum similarity for a vector match
+
+        Returns:
+            The matching existing bookmark or None, in input order
+        """
+        matches = [self.find_exact_duplicate(b) for b in new_bookmarks]
+
+        pending = [
+            (i, query)
+            for i, (bookmark, match) in enumerate(zip(new_bookmarks, matches))
+            if match is None and (query := self._similarity_query(bookmark))
+        ]
+        if pending and self._ensure_indexed():
             try:
-                search_content = (
-                    f"{new_bookmark.title} {new_bookmark.description}".strip()
+                nearest = self._nearest_bookmarks(
+                    [query for _, query in pending], similarity_threshold
                 )
-                if search_content:
-                    results = self.vector_store.search(search_content, n_results=3)
-
-                    for result in results.similar_bookmarks:
-                        if result.similarity_score >= similarity_threshold:
-                            result_id = result.bookmark.url
-                            for bookmark in self.bookmarks:
-                                if (
-                                    bookmark.url == result_id
-                                    or str(hash(bookmark.url)) == result_id
-                                ):
-                                    return bookmark
+                for (i, _), match in zip(pending, nearest):
+                    matches[i] = match
             except Exception as e:  # noqa: BLE001
                 logger.warning(f"Vector similarity check failed: {e}")
 
-        return None
+        return matches
 
     def analyze_collection(self) -> Dict:
         """Analyze the bookmark collection for insights."""
@@ -176,24 +319,22 @@ class BookmarkIntelligence:
 
         with Spinner("Analyzing collection..."):
             total = len(self.bookmarks)
-            enriched = len([b for b in self.bookmarks if b.is_enriched])
-
-            domain_counts: Counter[str] = Counter()
-            for bookmark in self.bookmarks:
-                domain = bookmark.domain
-                if domain:
-                    domain_counts[domain] += 1
 
-            tag_counts: Counter[str] = Counter()
+            # Gather every field in one pass; Counter then counts in C
+            enriched = 0
+            domains: List[str] = []
+            tags: List[str] = []
+            files: List[str] = []
             for bookmark in self.bookmarks:
+                enriched += bookmark.is_enriched
+                domains.append(bookmark.domain)
                 if bookmark.tags:
-                    for tag in bookmark.tags:
-                        tag_counts[tag.lower()] += 1
+                    tags.extend(bookmark.tags)
+                files.append(bookmark.source_file)
 
-            file_counts: Counter[str] = Counter()
-            for bookmark in self.bookmarks:
-                if bookmark.source_file:
-                    file_counts[bookmark.source_file] += 1
+            domain_counts = Counter(filter(None, domains))
+            tag_counts = Counter(map(str.lower, tags))
+            file_counts = Counter(filter(None, files))
 
         return {
             "total_bookmarks": total,
@@ -230,28 +371,51 @@ class BookmarkIntelligence:
             return []
 
         with Spinner("Finding suggestions..."):
-            query = f"{new_bookmark.title} {new_bookmark.content_text}"
-            search_result = self.vector_store.search(query, n_results=10)
-
-            if not search_result.similar_bookmarks:
-                return []
-
-            file_scores: dict[str, float] = defaultdict(float)
-            for similar in search_result.similar_bookmarks:
-                if similar.bookmark.source_file:
-                    file_scores[
-                        similar.bookmark.source_file
-                    ] += similar.similarity_score
-
-            max_score = max(file_scores.values()) if file_scores else 1.0
-            normalized_scores = [
-                (f, score / max_score) for f, score in file_scores.items()
-            ]
+            search_result = self.vector_store.search(
+                new_bookmark.query_text, n_results=10
+            )
+            return self._rank_source_files(search_result, n_suggestions)
+
+    def suggest_categorization_batch(
+        self, new_bookmarks: List[Bookmark], n_suggestions: int = 3
+    ) -> List[List[Tuple[str, float]]]:
+        """Suggest categories for several bookmarks with a single search call.
+
+        Returns:
+            One suggestion list per bookmark, in the same order
+        """
+        if not new_bookmarks:
+            return []
+        if not self._ensure_indexed():
+            return [[] for _ in new_bookmarks]
 
-            return sorted(normalized_scores, key=lambda x: x[1], reverse=True)[
-                :n_suggestions
+        with Spinner("Finding suggestions..."):
+            search_results = self.vector_store.search_batch(
+                [bookmark.query_text for bookmark in new_bookmarks], n_results=10
+            )
+            return [
+                self._rank_source_files(search_result, n_suggestions)
+                for search_result in search_results
             ]
 
+    @staticmethod
+    def _rank_source_files(
+        search_result: SearchResult, n_suggestions: int
+    ) -> List[Tuple[str, float]]:
+        """Sum hit scores per source file and return the best files."""
+        file_scores: dict[str, float] = defaultdict(float)
+        for similar in search_result.similar_bookmarks:
+            if similar.bookmark.source_file:
+                file_scores[similar.bookmark.source_file] += similar.similarity_score
+
+        # Pick the winners on raw scores, then normalize only those; the
+        # best score is the first one, so no separate max() pass is needed
+        top = nlargest(n_suggestions, file_scores.items(), key=itemgetter(1))
+        if not top:
+            return []
+        max_score = top[0][1] or 1.0
+        return [(f, score / max_score) for f, score in top]
+
     def _interactive_search(self, query: str) -> None:
         """Handle interactive search command."""
         result = self.search(query)
@@ -281,6 +445,8 @@ class BookmarkIntelligence:
 
         print(f"Found {len(duplicates)} duplicate groups:")
         removed: List[Bookmark] = []
+        # Groups hold the loaded objects themselves, so track removals by id
+        removed_ids: set[int] = set()
         for i, group in enumerate(duplicates, 1):
             reason = group.reason.replace("_", " ").title()
             print(f"\n{i}. {reason} (score: {group.similarity_score:.3f})")
@@ -299,12 +465,13 @@ class BookmarkIntelligence:
 
             if index > 0:
                 to_remove = group.bookmarks[index - 1]
-                if to_remove in self.bookmarks:
-                    self.bookmarks.remove(to_remove)
+                if id(to_remove) not in removed_ids:
+                    removed_ids.add(id(to_remove))
                     removed.append(to_remove)
                     print(f"Removed '{to_remove.title}'")
 
         if removed:
+            self.remove_bookmarks(removed)
             print(f"\nRemoved {len(removed)} bookmarks.")
             if self.input_path:
                 print("Saving changes...")
@@ -356,8 +523,7 @@ class BookmarkIntelligence:
 
         with Spinner(f"Extracting content from {url}..."):
             try:
-                web_extractor = WebExtractor()
-                title, description = web_extractor.extract_content(url)
+                title, description = self.web_extractor.extract_content(url)
                 temp_bookmark.title = title
                 temp_bookmark.description = description
             except Exception as e:  # noqa: BLE001
@@ -2,14 +2,13 @@
 Data models and types for bookmark processing.
 """
 
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
-from .url_utils import is_valid_url
+from .url_utils import extract_domain, is_valid_url
 
 
-@dataclass
+@dataclass(slots=True)
 class Bookmark:
     """Represents a bookmark with flexible field support."""
 
@@ -20,6 +19,23 @@ class Bookmark:
     tags: Optional[List[str]] = None
     bookmark_type: str = "link"
     source_file: str = ""
+    # Derived values cached as (source fields, value); a cache is used only
+    # while its source fields are unchanged, so assignment never pays for it
+    _search_text: Optional[Tuple[Any, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _domain: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _is_valid_url: Optional[Tuple[str, bool]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _normalized_title: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _query_text: Optional[Tuple[Any, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if self.tags is None:
@@ -48,14 +64,9 @@ class Bookmark:
 
     def to_dict(self, include_source_file: bool = False) -> Dict:
         """Convert bookmark back to dictionary with consistent field ordering."""
-        # Start with base fields in preferred order
-        result: Dict[str, Any] = {}
-
-        # URL field (use original field name preference)
-        if self.url.startswith("http"):
-            result["url"] = self.url
-        else:
-            result["link"] = self.url
+        # URL field first (use original field name preference)
+        url_key = "url" if self.url.startswith("http") else "link"
+        result: Dict[str, Any] = {url_key: self.url}
 
         # Title
         if self.title:
@@ -83,16 +94,28 @@ class Bookmark:
 
     @property
     def is_valid_url(self) -> bool:
-        """Check if bookmark has a valid URL."""
-        return is_valid_url(self.url)
+        """Check if bookmark has a valid URL, cached while url is unchanged."""
+        cached = self._is_valid_url
+        if cached is None or cached[0] != self.url:
+            cached = self._is_valid_url = (self.url, is_valid_url(self.url))
+        return cached[1]
 
     @property
     def domain(self) -> str:
-        """Extract domain from URL."""
-        try:
-            return urlparse(self.url).netloc
-        except Exception:
-            return ""
+        """Extract domain from URL, cached while url is unchanged."""
+        cached = self._domain
+        if cached is None or cached[0] != self.url:
+            cached = self._domain = (self.url, extract_domain(self.url))
+        return cached[1]
+
+    @property
+    def normalized_title(self) -> str:
+        """Lowercased, stripped title used for duplicate matching."""
+        cached = self._normalized_title
+        if cached is None or cached[0] != self.title:
+            normalized = self.title.lower().strip() if self.title else ""
+            cached = self._normalized_title = (self.title, normalized)
+        return cached[1]
 
     @property
     def content_text(self) -> str:
@@ -102,20 +125,42 @@ class Bookmark:
     @property
     def is_enriched(self) -> bool:
         """Check if bookmark has both content and tags."""
-        return bool(self.content_text and self.tags)
+        # Reads the fields directly; this runs once per bookmark in every
+        # enrichment partition and stats pass
+        return bool((self.description or self.excerpt) and self.tags)
 
     @property
-    def search_text(self) -> str:
-        """Get text suitable for searching/embedding."""
-        parts = [self.title]
-        if self.content_text:
-            parts.append(self.content_text)
-        if self.tags:
-            parts.append(" ".join(self.tags))
-        return " ".join(filter(None, parts))
-
+    def query_text(self) -> str:
+        """Title and content text used to query for similar bookmarks."""
+        key = (self.title, self.description, self.excerpt)
+        cached = self._query_text
+        if cached is None or cached[0] != key:
+            cached = self._query_text = (
+                key,
+                f"{self.title} {self.content_text}".strip(),
+            )
+        return cached[1]
 
-@dataclass
+    @property
+    def search_text(self) -> str:
+        """Get text suitable for searching/embedding.
+
+        The result is cached while title, description, excerpt and tags are
+        unchanged, including in-place edits to the tags list.
+        """
+        key = (self.title, self.description, self.excerpt, tuple(self.tags or ()))
+        cached = self._search_text
+        if cached is None or cached[0] != key:
+            parts = [self.title]
+            if self.content_text:
+                parts.append(self.content_text)
+            if self.tags:
+                parts.append(" ".join(self.tags))
+            cached = self._search_text = (key, " ".join(filter(None, parts)))
+        return cached[1]
+
+
+@dataclass(slots=True)
 class SimilarBookmark:
     """Represents a similar bookmark from vector search."""
 
@@ -127,7 +172,7 @@ class SimilarBookmark:
         return f"{self.bookmark.title} (score: {self.similarity_score:.3f})"
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Results from a bookmark search."""
 
@@ -139,7 +184,7 @@ class SearchResult:
         return f"Found {self.total_results} results for '{self.query}'"
 
 
-@dataclass
+@dataclass(slots=True)
 class DuplicateGroup:
     """Group of potentially duplicate bookmarks."""
 
@@ -3,12 +3,20 @@ Progress tracking and reporting utilities.
 """
 
 import time
-from typing import Optional
+from collections import deque
+from statistics import median
+from typing import Deque, Optional
 from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Recent per-item timings kept for the ETA
+RATE_WINDOW = 64
+
+# Items faster than this are assumed cached and left out of the ETA rate
+CACHED_ITEM_SECONDS = 0.1
+
 
 @dataclass
 class ProgressStats:
@@ -21,6 +29,7 @@ class ProgressStats:
     skipped: int
     start_time: float
     current_time: float
+    recent_items_per_second: float = 0.0
 
     @property
     def elapsed_seconds(self) -> float:
@@ -51,10 +60,15 @@ class ProgressStats:
 
     @property
     def estimated_remaining_seconds(self) -> float:
-        """Estimated remaining time in seconds."""
+        """Estimated remaining time in seconds.
+
+        Uses the recent (median) rate when there is one, so a fast cached
+        start or a slowdown midway does not skew the estimate.
+        """
         remaining_items = self.total - self.completed
-        if self.items_per_second > 0:
-            return remaining_items / self.items_per_second
+        rate = self.recent_items_per_second or self.items_per_second
+        if rate > 0:
+            return remaining_items / rate
         return 0
 
 
@@ -67,6 +81,7 @@ class ProgressTracker:
         description: str = "Processing",
         show_progress_bar: bool = True,
         update_interval: float = 1.0,
+        update_count_interval: int = 1,
     ):
         """
         Initialize progress tracker.
@@ -76,11 +91,14 @@ class ProgressTracker:
             description: Description of the operation
             show_progress_bar: Whether to show visual progress bar
             update_interval: How often to update display (seconds)
+            update_count_interval: Only check the clock every this many
+                updates; raise it for tight loops over cheap items
         """
         self.total = total
         self.description = description
         self.show_progress_bar = show_progress_bar
         self.update_interval = update_interval
+        self.update_count_interval = max(1, update_count_interval)
 
         self.completed = 0
         self.successful = 0
@@ -88,6 +106,12 @@ class ProgressTracker:
         self.skipped = 0
         self.start_time = time.time()
         self.last_update = 0.0
+        self._updates_since_check = 0
+
+        # Per-item seconds between clock checks, for the recent rate
+        self._item_seconds: Deque[float] = deque(maxlen=RATE_WINDOW)
+        self._last_sample_time = self.start_time
+        self._items_since_sample = 0
 
         self._last_message_length = 0
 
@@ -99,34 +123,51 @@ class ProgressTracker:
         success: bool = True,
         skip: bool = False,
         current_item: Optional[str] = None,
+        count: int = 1,
     ):
         """
-        Update progress with completion of one item.
+        Update progress with completion of one or more items.
 
         Args:
-            success: Whether the item was processed successfully
-            skip: Whether the item was skipped
+            success: Whether the items were processed successfully
+            skip: Whether the items were skipped
             current_item: Name/description of current item being processed
+            count: Number of items completed by this update
         """
-        self.completed += 1
+        self.completed += count
 
         if skip:
-            self.skipped += 1
+            self.skipped += count
         elif success:
-            self.successful += 1
+            self.successful += count
         else:
-            self.failed += 1
+            self.failed += count
+
+        if not self.show_progress_bar:
+            return
+
+        self._items_since_sample += count
+
+        # Skip the clock entirely between count checkpoints
+        self._updates_since_check += 1
+        finished = self.completed >= self.total
+        if self._updates_since_check < self.update_count_interval and not finished:
+            return
+        self._updates_since_check = 0
 
         current_time = time.time()
+        if self._items_since_sample > 0:
+            per_item = (
+                current_time - self._last_sample_time
+            ) / self._items_since_sample
+            if per_item >= CACHED_ITEM_SECONDS:
+                self._item_seconds.append(per_item)
+            self._last_sample_time = current_time
+            self._items_since_sample = 0
 
         # Update display if enough time has passed or if completed
-        if (
-            current_time - self.last_update >= self.update_interval
-            or self.completed >= self.total
-        ):
-            if self.show_progress_bar:
-                self._update_display(current_item)
-
+        if current_time - self.last_update >= self.update_interval or finished:
+            self._update_display(current_item)
             self.last_update = current_time
 
     def _update_display(self, current_item: Optional[str] = None):
@@ -171,11 +212,9 @@ class ProgressTracker:
 
         message = " ".join(message_parts)
 
-        # Clear previous message and print new one
-        if self._last_message_length > len(message):
-            # Clear extra characters from previous longer message
-            print(" " * self._last_message_length, end="\r")
-
+        # Pad over the tail of a longer previous message so the line is
+        # redrawn with one write and one flush
+        message += " " * (self._last_message_length - len(message))
         print(message, end="", flush=True)
         self._last_message_length = len(message)
 
@@ -183,14 +222,11 @@ class ProgressTracker:
         """Format time duration in human-readable format."""
         if seconds < 60:
             return f"{seconds:.0f}s"
-        elif seconds < 3600:
-            minutes = int(seconds / 60)
-            secs = int(seconds % 60)
+        minutes, secs = divmod(int(seconds), 60)
+        if minutes < 60:
             return f"{minutes}m{secs:02d}s"
-        else:
-            hours = int(seconds / 3600)
-            minutes = int((seconds % 3600) / 60)
-            return f"{hours}h{minutes:02d}m"
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}h{minutes:02d}m"
 
     def get_stats(self) -> ProgressStats:
         """Get current progress statistics."""
@@ -202,6 +238,9 @@ class ProgressTracker:
             skipped=self.skipped,
             start_time=self.start_time,
             current_time=time.time(),
+            recent_items_per_second=(
+                1.0 / median(self._item_seconds) if self._item_seconds else 0.0
+            ),
         )
 
     def finish(self, final_message: Optional[str] = None):
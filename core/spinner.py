@@ -1,6 +1,5 @@
 import sys
 import threading
-import time
 import itertools
 
 
@@ -20,28 +19,40 @@ class Spinner:
         self.busy = False
         self.spinner_thread = None
         self.message = message
+        self._stopped = threading.Event()
 
     def start(self):
         """Start the spinner."""
         self.busy = True
-        self.spinner_thread = threading.Thread(target=self._spin)
+        # Frames only make sense on a terminal; pipes and log files get the
+        # message once instead of a write and flush every 80 ms
+        if not sys.stdout.isatty():
+            sys.stdout.write(f"{self.message}\n")
+            return
+        self._stopped.clear()
+        self.spinner_thread = threading.Thread(target=self._spin, daemon=True)
         self.spinner_thread.start()
 
     def stop(self):
         """Stop the spinner."""
         self.busy = False
-        if self.spinner_thread:
-            self.spinner_thread.join()
+        self._stopped.set()
+        if not self.spinner_thread:
+            return
+        self.spinner_thread.join()
+        self.spinner_thread = None
         # Clear the line
         sys.stdout.write("\r" + " " * (len(self.message) + 5) + "\r")
         sys.stdout.flush()
 
     def _spin(self):
         """The actual spinning logic."""
-        while self.busy:
+        # Waiting on the event rather than sleeping lets stop() return at
+        # once instead of after the rest of the current frame
+        while not self._stopped.is_set():
             sys.stdout.write(f"\r{next(self.spinner_chars)} {self.message}")
             sys.stdout.flush()
-            time.sleep(self.delay)
+            self._stopped.wait(self.delay)
 
     def __enter__(self):
         """Context manager start."""
@@ -1,6 +1,47 @@
 """Utility functions for working with URLs."""
 
-from urllib.parse import urlparse
+import re
+
+# Prefixes of accepted URLs (lowercased), checked before the authority match
+_VALID_PREFIXES = ("http://", "https://", "ftp://", "ftps://")
+
+# Authority (userinfo, host and port) following the scheme
+_AUTHORITY_PATTERN = re.compile(r"[A-Za-z]+://([^/?#]*)")
+
+# Dotted quad with each octet in 0-255
+_IPV4_PATTERN = re.compile(
+    r"(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])\.){3}"
+    r"(?:25[0-5]|2[0-4][0-9]|[01]?[0-9]?[0-9])"
+)
+
+# Dot-separated ASCII labels with at least one dot and no leading/trailing hyphen
+_DOMAIN_PATTERN = re.compile(r"(?!-)[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)+(?<!-)")
+
+# Characters that end the host part of a URL
+_NETLOC_TERMINATORS = "/?#"
+
+
+def extract_domain(url: str) -> str:
+    """Return the lowercase host of a URL without userinfo or port.
+
+    Uses plain string slicing rather than urlparse; URLs without a scheme
+    separator yield an empty string.
+    """
+    start = url.find("://")
+    if start < 0:
+        return ""
+    start += 3
+    end = len(url)
+    for terminator in _NETLOC_TERMINATORS:
+        found = url.find(terminator, start, end)
+        if found >= 0:
+            end = found
+    netloc = url[start:end]
+    netloc = netloc[netloc.rfind("@") + 1 :]
+    if netloc.startswith("["):
+        # IPv6 literal; the port follows the closing bracket
+        return netloc[: netloc.find("]") + 1].lower()
+    return netloc.split(":", 1)[0].lower()
 
 
 def is_valid_url(url: str) -> bool:
@@ -8,42 +49,22 @@ def is_valid_url(url: str) -> bool:
     if not url or not isinstance(url, str):
         return False
 
-    try:
-        parsed = urlparse(url.strip())
-        if not parsed.scheme or not parsed.netloc:
-            return False
-
-        if parsed.scheme not in ["http", "https", "ftp", "ftps"]:
-            return False
-
-        domain = parsed.netloc.split(":")[0]
-        if not domain or domain.startswith(".") or domain.endswith("."):
-            return False
-
-        if domain == "localhost":
-            return True
-
-        ip_parts = domain.split(".")
-        if len(ip_parts) == 4:
-            try:
-                for part in ip_parts:
-                    num = int(part)
-                    if not (0 <= num <= 255):
-                        break
-                else:
-                    return True
-            except ValueError:
-                pass
-
-        if "." in domain and ".." not in domain:
-            allowed = set(
-                "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-"
-            )
-            if all(c in allowed for c in domain):
-                if not domain.startswith("-") and not domain.endswith("-"):
-                    return True
+    url = url.strip()
+    # Schemes are case-insensitive; the longest prefix is eight characters
+    if not url[:8].lower().startswith(_VALID_PREFIXES):
+        return False
 
+    match = _AUTHORITY_PATTERN.match(url)
+    if not match or not match.group(1):
         return False
 
-    except Exception:
+    authority = match.group(1)
+    # Bracketed (IPv6) hosts are not accepted
+    if "[" in authority or "]" in authority:
         return False
+
+    domain = authority.split(":")[0]
+    if domain == "localhost":
+        return True
+
+    return bool(_IPV4_PATTERN.fullmatch(domain) or _DOMAIN_PATTERN.fullmatch(domain))
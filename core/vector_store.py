@@ -3,13 +3,42 @@ Vector store operations using ChromaDB and Ollama.
 """
 
 import chromadb
+import hashlib
+import json
 import ollama
 import logging
-from typing import Any, List, Dict, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Dict, Optional, Set, Tuple
+from .embedding_cache import EmbeddingCache, default_cache_dir
 from .models import Bookmark, SimilarBookmark, SearchResult
 
 logger = logging.getLogger(__name__)
 
+# Documents embedded and written to Chroma per add/upsert call; keeps memory
+# bounded and stays under Chroma's maximum batch size
+CHROMA_WRITE_BATCH_SIZE = 1000
+
+# Stand-in vector for texts whose embedding request failed
+_ZERO_EMBEDDING = (0.0,) * 768
+
+# Batched embedding requests kept in flight at once, so HTTP round trips
+# overlap with the server's work on other batches
+EMBEDDING_WORKERS = 4
+
+
+def default_persist_dir() -> str:
+    """Return the directory for the persisted ChromaDB collections."""
+    return os.path.join(default_cache_dir(), "chroma")
+
+
+def collection_name_for(prefix: str, path: str) -> str:
+    """Return a collection name unique to one input file or directory."""
+    digest = hashlib.blake2b(
+        os.path.abspath(path).encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return f"{prefix}_{digest}"
+
 
 class VectorStore:
     """Handles vector database operations for bookmarks."""
@@ -19,6 +48,10 @@ class VectorStore:
         collection_name: str = "bookmarks",
         ollama_url: str = "http://localhost:11434",
         embedding_model: str = "nomic-embed-text",
+        embedding_batch_size: int = 32,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_workers: int = EMBEDDING_WORKERS,
+        persist_dir: Optional[str] = None,
     ):
         """
         Initialize vector store.
@@ -27,28 +60,74 @@ class VectorStore:
             collection_name: Name of ChromaDB collection
             ollama_url: URL for Ollama API
             embedding_model: Model name for embeddings
+            embedding_batch_size: Texts sent per batched embedding request
+            embedding_cache: Cache for document and query embeddings (defaults
+                to an on-disk cache for embedding_model)
+            embedding_workers: Batched embedding requests sent concurrently
+            persist_dir: Directory for an on-disk ChromaDB that survives
+                restarts; None keeps the collection in memory
         """
         self.collection_name = collection_name
         self.ollama_url = ollama_url
         self.embedding_model = embedding_model
+        # One client per store so requests reuse its connection pool and go to
+        # ollama_url rather than the library's default host
+        self.ollama_client = ollama.Client(host=ollama_url)
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_workers = max(1, embedding_workers)
+        self.embedding_cache = embedding_cache or EmbeddingCache(embedding_model)
 
         # Initialize ChromaDB
-        self.client = chromadb.Client()
+        self.persist_dir = persist_dir
+        if persist_dir:
+            self.client = chromadb.PersistentClient(
+                path=os.path.expanduser(persist_dir)
+            )
+        else:
+            self.client = chromadb.Client()
         self.collection: Optional[Any] = None
         self._initialize_collection()
 
     def _initialize_collection(self):
         """Initialize or get existing ChromaDB collection."""
-        try:
-            self.collection = self.client.get_collection(name=self.collection_name)
-            logger.info(f"Using existing ChromaDB collection: {self.collection_name}")
-        except Exception:
-            self.collection = self.client.create_collection(name=self.collection_name)
-            logger.info(f"Created new ChromaDB collection: {self.collection_name}")
+        metadata = {"embedding_model": self.embedding_model}
+        # Metadata only applies when the collection is created; an existing
+        # collection keeps the model it was built with
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name, metadata=metadata
+        )
+
+        # A persisted collection may hold vectors from another embedding model
+        stored_model = (self.collection.metadata or {}).get("embedding_model")
+        if self.persist_dir and stored_model != self.embedding_model:
+            logger.info(
+                f"Recreating {self.collection_name} for {self.embedding_model} "
+                f"(was {stored_model})"
+            )
+            self.client.delete_collection(name=self.collection_name)
+            self.collection = self.client.create_collection(
+                name=self.collection_name, metadata=metadata
+            )
+        logger.info(f"Using ChromaDB collection: {self.collection_name}")
+
+    def use_collection(self, collection_name: str) -> None:
+        """
+        Switch to another ChromaDB collection, creating it if needed.
+
+        Args:
+            collection_name: Name of ChromaDB collection
+        """
+        if collection_name == self.collection_name and self.collection is not None:
+            return
+        self.collection_name = collection_name
+        self._initialize_collection()
 
     def get_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
-        Get embeddings for texts using Ollama.
+        Get embeddings for texts with one Ollama request per text.
+
+        Up to embedding_workers requests run at once; a text whose request
+        fails gets a zero vector.
 
         Args:
             texts: List of texts to embed
@@ -56,33 +135,110 @@ class VectorStore:
         Returns:
             List of embedding vectors
         """
-        embeddings = []
-        for text in texts:
-            try:
-                response = ollama.embeddings(model=self.embedding_model, prompt=text)
-                embeddings.append(response["embedding"])
-            except Exception as e:
-                logger.error(f"Error getting embedding for text: {e}")
-                # Return a zero vector as fallback
-                embeddings.append([0.0] * 768)  # Default embedding size
-        return embeddings
+        if self.embedding_workers > 1 and len(texts) > 1:
+            workers = min(self.embedding_workers, len(texts))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self._embed_text, texts))
+        return [self._embed_text(text) for text in texts]
+
+    def _embed_text(self, text: str) -> List[float]:
+        """Embed one text, returning a zero vector if the request fails."""
+        try:
+            response = self.ollama_client.embeddings(
+                model=self.embedding_model, prompt=text
+            )
+            return response["embedding"]
+        except Exception as e:
+            logger.error(f"Error getting embedding for text: {e}")
+            # Return a zero vector as fallback
+            return list(_ZERO_EMBEDDING)
 
-    def add_bookmarks(self, bookmarks: List[Bookmark]) -> bool:
+    def get_embeddings_batch(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> List[List[float]]:
         """
-        Add bookmarks to the vector store.
+        Get embeddings for texts with one Ollama request per batch.
+
+        Up to embedding_workers batches are in flight at once. Falls back to
+        per-text requests for a batch when the batched call fails, e.g.
+        against servers that predate the /api/embed endpoint.
 
         Args:
-            bookmarks: List of Bookmark objects to add
+            texts: List of texts to embed
+            batch_size: Texts per request (defaults to embedding_batch_size)
 
         Returns:
-            True if successful, False otherwise
+            List of embedding vectors, in the same order as texts
         """
-        if not bookmarks:
-            return True
+        size = max(1, batch_size or self.embedding_batch_size)
+        chunks = [texts[start : start + size] for start in range(0, len(texts), size)]
+        if self.embedding_workers > 1 and len(chunks) > 1:
+            workers = min(self.embedding_workers, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._embed_chunk, chunks))
+        else:
+            results = [self._embed_chunk(chunk) for chunk in chunks]
+        return [vector for vectors in results for vector in vectors]
+
+    def _embed_chunk(self, chunk: List[str]) -> List[List[float]]:
+        """Embed one batch, falling back to per-text requests on failure."""
+        try:
+            response = self.ollama_client.embed(model=self.embedding_model, input=chunk)
+            vectors = list(response["embeddings"])
+            if len(vectors) != len(chunk):
+                raise ValueError(
+                    f"expected {len(chunk)} embeddings, got {len(vectors)}"
+                )
+            return vectors
+        except Exception as e:
+            logger.warning(f"Batched embedding failed ({e}), embedding per text")
+            return self.get_embeddings(chunk)
+
+    def get_cached_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for texts, only requesting those not already cached.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            List of embedding vectors, in the same order as texts
+        """
+        hits, misses = self.embedding_cache.get_many(texts)
+        embeddings: List[List[float]] = [[] for _ in texts]
+        for i, vector in hits.items():
+            embeddings[i] = vector.tolist()
+        if misses:
+            missing_texts = [texts[i] for i in misses]
+            fresh = self.get_embeddings_batch(missing_texts)
+            self.embedding_cache.put_many(missing_texts, fresh)
+            for i, vector in zip(misses, fresh):
+                embeddings[i] = list(vector)
+        return embeddings
+
+    @staticmethod
+    def _prepare_documents(
+        bookmarks: List[Bookmark],
+    ) -> Tuple[List[str], List[Dict[str, str]], List[str]]:
+        """
+        Build the documents, metadata and ids stored for bookmarks.
+
+        Each metadata entry carries a content_hash of everything stored for
+        the bookmark, which sync_bookmarks uses to detect changes.
+
+        Args:
+            bookmarks: List of Bookmark objects
 
+        Returns:
+            Tuple of (documents, metadatas, ids); bookmarks without a URL or
+            searchable text are skipped
+        """
         documents = []
         metadatas = []
         ids = []
+        seen_ids: Set[str] = set()
+        # Next suffix to try per URL, so repeats don't rescan from _1
+        next_suffix: Dict[str, int] = {}
 
         for bookmark in bookmarks:
             if not bookmark.url or not bookmark.search_text:
@@ -101,26 +257,56 @@ class VectorStore:
                 }
             )
 
-            # Handle duplicate URLs
+            # Handle duplicate URLs; ids are derived from the URL alone so
+            # they stay the same across runs and processes
             bookmark_id = bookmark.url
-            counter = 1
-            while bookmark_id in ids:
-                bookmark_id = f"{bookmark.url}_{counter}"
-                counter += 1
+            if bookmark_id in seen_ids:
+                counter = next_suffix.get(bookmark.url, 1)
+                while bookmark_id in seen_ids:
+                    bookmark_id = f"{bookmark.url}_{counter}"
+                    counter += 1
+                next_suffix[bookmark.url] = counter
+            seen_ids.add(bookmark_id)
             ids.append(bookmark_id)
 
+        for document, metadata in zip(documents, metadatas):
+            content = json.dumps([document, metadata], sort_keys=True)
+            metadata["content_hash"] = hashlib.blake2b(
+                content.encode("utf-8"), digest_size=16
+            ).hexdigest()
+
+        return documents, metadatas, ids
+
+    def add_bookmarks(self, bookmarks: List[Bookmark]) -> bool:
+        """
+        Add bookmarks to the vector store.
+
+        Args:
+            bookmarks: List of Bookmark objects to add
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not bookmarks:
+            return True
+
+        documents, metadatas, ids = self._prepare_documents(bookmarks)
+
         if not documents:
             logger.warning("No valid bookmarks to add to vector store")
             return False
 
         try:
-            # Get embeddings
-            embeddings = self.get_embeddings(documents)
-
             assert self.collection is not None
-            self.collection.add(
-                documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings
-            )
+            for start in range(0, len(documents), CHROMA_WRITE_BATCH_SIZE):
+                end = start + CHROMA_WRITE_BATCH_SIZE
+                batch = documents[start:end]
+                self.collection.add(
+                    documents=batch,
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
+                    embeddings=self.get_cached_embeddings(batch),
+                )
 
             logger.info(f"Added {len(documents)} bookmarks to vector store")
             return True
@@ -129,6 +315,55 @@ class VectorStore:
             logger.error(f"Error adding bookmarks to vector store: {e}")
             return False
 
+    @staticmethod
+    def _to_search_result(
+        query: str, results: Dict[str, Any], row: int = 0
+    ) -> SearchResult:
+        """Convert one query's rows of a Chroma query response."""
+        similar_bookmarks = []
+        documents = results["documents"][row] if results["documents"] else []
+        if documents:
+            distances = (
+                results["distances"][row]
+                if results.get("distances")
+                else [0] * len(documents)
+            )
+            for doc, metadata, distance in zip(
+                documents, results["metadatas"][row], distances
+            ):
+                # Convert metadata back to Bookmark
+                tags_data = metadata.get("tags", "")
+                if isinstance(tags_data, list):
+                    tags = tags_data
+                elif isinstance(tags_data, str):
+                    tags = tags_data.split(",") if tags_data else []
+                else:
+                    tags = []
+
+                bookmark = Bookmark(
+                    url=metadata["url"],
+                    title=metadata["title"],
+                    tags=tags,
+                    source_file=metadata.get("source_file", ""),
+                )
+
+                # Calculate similarity score (higher is better)
+                similarity_score = 1.0 - distance if distance else 1.0
+
+                similar_bookmarks.append(
+                    SimilarBookmark(
+                        bookmark=bookmark,
+                        similarity_score=similarity_score,
+                        content=doc,
+                    )
+                )
+
+        return SearchResult(
+            query=query,
+            similar_bookmarks=similar_bookmarks,
+            total_results=len(similar_bookmarks),
+        )
+
     def search(self, query: str, n_results: int = 10) -> SearchResult:
         """
         Search for similar bookmarks.
@@ -142,62 +377,52 @@ class VectorStore:
         """
         try:
             # Get query embedding
-            query_embeddings = self.get_embeddings([query])
+            query_embeddings = self.get_cached_embeddings([query])
 
             assert self.collection is not None
             results = self.collection.query(
                 query_embeddings=query_embeddings, n_results=n_results
             )
+            return self._to_search_result(query, results)
 
-            similar_bookmarks = []
-            if results["documents"] and results["documents"][0]:
-                for i, (doc, metadata, distance) in enumerate(
-                    zip(
-                        results["documents"][0],
-                        results["metadatas"][0],
-                        (
-                            results["distances"][0]
-                            if results.get("distances")
-                            else [0] * len(results["documents"][0])
-                        ),
-                    )
-                ):
-                    # Convert metadata back to Bookmark
-                    tags_data = metadata.get("tags", "")
-                    if isinstance(tags_data, list):
-                        tags = tags_data
-                    elif isinstance(tags_data, str):
-                        tags = tags_data.split(",") if tags_data else []
-                    else:
-                        tags = []
-
-                    bookmark = Bookmark(
-                        url=metadata["url"],
-                        title=metadata["title"],
-                        tags=tags,
-                        source_file=metadata.get("source_file", ""),
-                    )
+        except Exception as e:
+            logger.error(f"Error searching vector store: {e}")
+            return SearchResult(query=query, similar_bookmarks=[], total_results=0)
 
-                    # Calculate similarity score (higher is better)
-                    similarity_score = 1.0 - distance if distance else 1.0
+    def search_batch(
+        self, queries: List[str], n_results: int = 10
+    ) -> List[SearchResult]:
+        """
+        Search for several queries with one embedding pass and one query.
 
-                    similar_bookmarks.append(
-                        SimilarBookmark(
-                            bookmark=bookmark,
-                            similarity_score=similarity_score,
-                            content=doc,
-                        )
-                    )
+        Args:
+            queries: Search queries
+            n_results: Number of results to return per query
+
+        Returns:
+            SearchResult objects, in the same order as queries
+        """
+        if not queries:
+            return []
+
+        try:
+            query_embeddings = self.get_cached_embeddings(queries)
 
-            return SearchResult(
-                query=query,
-                similar_bookmarks=similar_bookmarks,
-                total_results=len(similar_bookmarks),
+            assert self.collection is not None
+            results = self.collection.query(
+                query_embeddings=query_embeddings, n_results=n_results
             )
+            return [
+                self._to_search_result(query, results, row)
+                for row, query in enumerate(queries)
+            ]
 
         except Exception as e:
             logger.error(f"Error searching vector store: {e}")
-            return SearchResult(query=query, similar_bookmarks=[], total_results=0)
+            return [
+                SearchResult(query=query, similar_bookmarks=[], total_results=0)
+                for query in queries
+            ]
 
     def clear(self) -> bool:
         """
@@ -234,6 +459,61 @@ class VectorStore:
             logger.error(f"Error getting vector store stats: {e}")
             return {}
 
+    def sync_bookmarks(self, bookmarks: List[Bookmark]) -> bool:
+        """
+        Bring the vector store in line with bookmarks, touching only changes.
+
+        New and changed bookmarks are embedded and upserted, bookmarks no
+        longer present are deleted, and unchanged ones are left alone.
+
+        Args:
+            bookmarks: List of Bookmark objects
+
+        Returns:
+            True if successful, False otherwise
+        """
+        documents, metadatas, ids = self._prepare_documents(bookmarks)
+
+        try:
+            assert self.collection is not None
+            existing = self.collection.get(include=["metadatas"])
+            stored_hashes = {
+                stored_id: (metadata or {}).get("content_hash")
+                for stored_id, metadata in zip(
+                    existing["ids"], existing["metadatas"] or []
+                )
+            }
+
+            current_ids = set(ids)
+            removed = [i for i in stored_hashes if i not in current_ids]
+            changed = [
+                i
+                for i, (bookmark_id, metadata) in enumerate(zip(ids, metadatas))
+                if stored_hashes.get(bookmark_id) != metadata["content_hash"]
+            ]
+
+            if removed:
+                self.collection.delete(ids=removed)
+            for start in range(0, len(changed), CHROMA_WRITE_BATCH_SIZE):
+                batch = changed[start : start + CHROMA_WRITE_BATCH_SIZE]
+                batch_documents = [documents[i] for i in batch]
+                self.collection.upsert(
+                    documents=batch_documents,
+                    metadatas=[metadatas[i] for i in batch],
+                    ids=[ids[i] for i in batch],
+                    embeddings=self.get_cached_embeddings(batch_documents),
+                )
+
+            logger.info(
+                f"Synced vector store: {len(changed)} updated, "
+                f"{len(removed)} removed, {len(ids) - len(changed)} unchanged"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error syncing vector store: {e}")
+            return False
+
     def rebuild_from_bookmarks(self, bookmarks: List[Bookmark]) -> bool:
         """
         Rebuild the vector store from a list of bookmarks.
@@ -244,6 +524,11 @@ class VectorStore:
         Returns:
             True if successful, False otherwise
         """
+        # A persisted collection already holds most bookmarks from earlier
+        # runs, so only apply the differences
+        if self.persist_dir:
+            return self.sync_bookmarks(bookmarks)
+
         # Clear existing data
         if not self.clear():
             return False
@@ -2,34 +2,138 @@
 Web content extraction utilities.
 """
 
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests  # type: ignore
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from urllib3.util.retry import Retry
 import logging
-from typing import Tuple
+from typing import Dict, List, Tuple
 from urllib.parse import urlparse
 
 from .url_utils import is_valid_url
 
 logger = logging.getLogger(__name__)
 
+try:
+    import lxml  # type: ignore # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml is a declared dependency
+    HTML_PARSER = "html.parser"
+
+# Concurrent page fetches per extractor; the pool keeps a connection per worker
+WEB_FETCH_WORKERS = 12
+
+# Only the title and meta tags are read, so skip building the rest of the tree
+PAGE_METADATA_TAGS = SoupStrainer(["title", "meta"])
+
+# Retry brief server-side hiccups only; dead hosts and timeouts fail at once
+# so link checks stay fast, and Retry-After is ignored to avoid long stalls
+_RETRY_POLICY = Retry(
+    total=2,
+    connect=0,
+    read=0,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    backoff_factor=0.3,
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+# (attribute, value) of the meta tags holding a description, by preference
+_DESCRIPTION_META_KEYS = (
+    ("name", "description"),
+    ("property", "og:description"),
+    ("name", "twitter:description"),
+)
+
+# Title and meta tags live in <head>; the body never needs tokenizing
+_HEAD_END_PATTERN = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+
+class HostRateLimiter:
+    """Space out requests to the same host by a minimum interval."""
+
+    def __init__(self, min_interval: float = 0.5) -> None:
+        self.min_interval = min_interval
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the URL's host is allowed."""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(host, now))
+            self._next_allowed[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
 
 class WebExtractor:
     """Handles extraction of content from web pages."""
 
-    def __init__(self, timeout: int = 10):
+    def __init__(
+        self,
+        timeout: int = 10,
+        pool_size: int = WEB_FETCH_WORKERS,
+        min_interval: float = 0.5,
+    ):
         """
         Initialize web extractor.
 
         Args:
             timeout: Request timeout in seconds
+            pool_size: Connections kept open per host; match it to the number
+                of threads sharing this extractor
+            min_interval: Minimum seconds between requests to the same host
         """
         self.timeout = timeout
+        self.pool_size = pool_size
+        self.rate_limiter = HostRateLimiter(min_interval)
         self.headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) " "AppleWebKit/537.36"
             )
         }
 
+        # One connection pool shared by every thread; urllib3 pools are
+        # thread-safe, but requests sessions are not, so each thread gets its
+        # own session mounting this adapter
+        self._adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=_RETRY_POLICY,
+        )
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the calling thread's session, creating it on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        """Close pooled connections shared by all threads' sessions."""
+        self._adapter.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> "WebExtractor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     def extract_content(self, url: str) -> Tuple[str, str]:
         """
         Extract title and description from a webpage.
@@ -41,10 +145,11 @@ class WebExtractor:
             Tuple of (title, description)
         """
         try:
-            response = requests.get(url, timeout=self.timeout, headers=self.headers)
+            self.rate_limiter.wait(url)
+            response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, "html.parser")
+            soup = self._parse_html(response.content)
 
             title = self._extract_title(soup)
             description = self._extract_description(soup)
@@ -61,6 +166,29 @@ class WebExtractor:
             logger.warning(f"Failed to extract content from {url}: {e}")
             return "", ""
 
+    def extract_many(self, urls: List[str]) -> List[Tuple[str, str]]:
+        """
+        Extract title and description from several pages concurrently.
+
+        Args:
+            urls: URLs to extract content from
+
+        Returns:
+            (title, description) tuples, in the same order as urls
+        """
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(urls))) as pool:
+            return list(pool.map(self.extract_content, urls))
+
+    @staticmethod
+    def _parse_html(content: bytes) -> BeautifulSoup:
+        """Parse the title and meta tags of a page, stopping after <head>."""
+        head_end = _HEAD_END_PATTERN.search(content)
+        if head_end:
+            content = content[: head_end.end()]
+        return BeautifulSoup(content, HTML_PARSER, parse_only=PAGE_METADATA_TAGS)
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract title from soup."""
         title_tag = soup.find("title")
@@ -70,26 +198,22 @@ class WebExtractor:
 
     def _extract_description(self, soup: BeautifulSoup) -> str:
         """Extract description from meta tags."""
-        # Try standard meta description
-        meta_desc = soup.find("meta", attrs={"name": "description"})
-        if isinstance(meta_desc, Tag):
-            content = meta_desc.get("content")
-            if isinstance(content, str):
-                return content.strip()
-
-        # Try Open Graph description
-        og_desc = soup.find("meta", attrs={"property": "og:description"})
-        if isinstance(og_desc, Tag):
-            content = og_desc.get("content")
-            if isinstance(content, str):
-                return content.strip()
-
-        # Try Twitter card description
-        twitter_desc = soup.find("meta", attrs={"name": "twitter:description"})
-        if isinstance(twitter_desc, Tag):
-            content = twitter_desc.get("content")
-            if isinstance(content, str):
-                return content.strip()
+        # One pass over the meta tags, keeping the first tag of each kind;
+        # standard, Open Graph and Twitter card descriptions are tried in order
+        found: Dict[str, Tag] = {}
+        for meta in soup.find_all("meta"):
+            for attr, value in _DESCRIPTION_META_KEYS:
+                if meta.get(attr) == value:
+                    found.setdefault(value, meta)
+            if len(found) == len(_DESCRIPTION_META_KEYS):
+                break
+
+        for _, value in _DESCRIPTION_META_KEYS:
+            meta = found.get(value)
+            if meta is not None:
+                content = meta.get("content")
+                if isinstance(content, str):
+                    return content.strip()
 
         return ""
 
@@ -107,9 +231,8 @@ class WebExtractor:
             return False
 
         try:
-            response = requests.head(
-                url, timeout=5, headers=self.headers, allow_redirects=True
-            )
+            self.rate_limiter.wait(url)
+            response = self.session.head(url, timeout=5, allow_redirects=True)
             return response.status_code < 400
         except Exception:
             return False
@@ -4,15 +4,18 @@ Pytest configuration and fixtures.
 
 import pytest
 import json
-import tempfile
-import os
 from typing import List
 from core.models import Bookmark
 
 
-@pytest.fixture
-def sample_bookmarks() -> List[Bookmark]:
-    """Sample bookmarks for testing."""
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep on-disk caches written during tests out of the user's home."""
+    monkeypatch.setenv("BOOKMARKS_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def _sample_bookmarks() -> List[Bookmark]:
+    """Build a fresh copy of the sample bookmarks."""
     return [
         Bookmark(
             url="https://python.org",
@@ -38,6 +41,15 @@ def sample_bookmarks() -> List[Bookmark]:
     ]
 
 
+@pytest.fixture
+def sample_bookmarks() -> List[Bookmark]:
+    """Sample bookmarks for testing.
+
+    Function-scoped because tests edit bookmark fields in place.
+    """
+    return _sample_bookmarks()
+
+
 @pytest.fixture
 def sample_unenriched_bookmarks() -> List[Bookmark]:
     """Sample unenriched bookmarks for testing."""
@@ -54,54 +66,38 @@ def sample_unenriched_bookmarks() -> List[Bookmark]:
     ]
 
 
-@pytest.fixture
-def temp_json_file(sample_bookmarks):
-    """Create a temporary JSON file with sample bookmarks."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        data = [bookmark.to_dict() for bookmark in sample_bookmarks]
-        json.dump(data, f, indent=2)
-        temp_path = f.name
-
-    yield temp_path
+@pytest.fixture(scope="session")
+def temp_json_file(tmp_path_factory):
+    """Create a JSON file with sample bookmarks, shared read-only by tests."""
+    path = tmp_path_factory.mktemp("json") / "bookmarks.json"
+    data = [bookmark.to_dict() for bookmark in _sample_bookmarks()]
+    path.write_text(json.dumps(data, indent=2))
+    return str(path)
 
-    # Cleanup
-    if os.path.exists(temp_path):
-        os.unlink(temp_path)
 
-
-@pytest.fixture
-def temp_directory(sample_bookmarks):
-    """Create a temporary directory with multiple JSON files."""
-    temp_dir = tempfile.mkdtemp()
+@pytest.fixture(scope="session")
+def temp_directory(tmp_path_factory):
+    """Create a directory with multiple JSON files, shared read-only by tests."""
+    temp_dir = tmp_path_factory.mktemp("bookmarks")
+    bookmarks = _sample_bookmarks()
 
     # Create multiple files
-    file1_data = [sample_bookmarks[0].to_dict(), sample_bookmarks[1].to_dict()]
-    file2_data = [sample_bookmarks[2].to_dict()]
-
-    file1_path = os.path.join(temp_dir, "file1.json")
-    file2_path = os.path.join(temp_dir, "file2.json")
+    file1_data = [bookmarks[0].to_dict(), bookmarks[1].to_dict()]
+    file2_data = [bookmarks[2].to_dict()]
 
-    with open(file1_path, "w") as f:
-        json.dump(file1_data, f, indent=2)
+    (temp_dir / "file1.json").write_text(json.dumps(file1_data, indent=2))
+    (temp_dir / "file2.json").write_text(json.dumps(file2_data, indent=2))
 
-    with open(file2_path, "w") as f:
-        json.dump(file2_data, f, indent=2)
+    return str(temp_dir)
 
-    yield temp_dir
 
-    # Cleanup
-    import shutil
-
-    shutil.rmtree(temp_dir)
-
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ollama_response():
     """Mock Ollama API response."""
     return {"embedding": [0.1] * 768}  # Mock embedding vector
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_web_response():
     """Mock web response content."""
     return """
@@ -1,9 +1,20 @@
 import json
 import csv
+import pytest
 from unittest.mock import patch
 
 from core.importer import BookmarkImporter
 from core.bookmark_loader import BookmarkLoader
+from core.models import Bookmark
+
+
+def _no_duplicates(bookmarks, *args, **kwargs):
+    return [None] * len(bookmarks)
+
+
+def _suggest(filename):
+    """Stand-in for suggest_categorization_batch that picks one file."""
+    return lambda bookmarks, *args, **kwargs: [[(filename, 1.0)] for _ in bookmarks]
 
 
 def create_new_file(tmp_path, data):
@@ -84,12 +95,12 @@ def test_importer_adds_bookmark(tmp_path, sample_bookmarks):
                 return_value=("Title", "Desc"),
             ),
             patch(
-                "core.importer.BookmarkIntelligence.suggest_categorization",
-                return_value=[("file1.json", 1.0)],
+                "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+                side_effect=_suggest("file1.json"),
             ),
             patch(
-                "core.importer.BookmarkIntelligence.is_duplicate",
-                return_value=None,
+                "core.importer.BookmarkIntelligence.is_duplicate_batch",
+                side_effect=_no_duplicates,
             ),
         ):
             dead, duplicates = importer.import_from_file(str(new_file))
@@ -136,12 +147,12 @@ def test_importer_parses_html(mock_summary, tmp_path):
             return_value=("Title", "Desc"),
         ),
         patch(
-            "core.importer.BookmarkIntelligence.suggest_categorization",
-            return_value=[("uncategorized.json", 1.0)],
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
         ),
         patch(
-            "core.importer.BookmarkIntelligence.is_duplicate",
-            return_value=None,
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
         ),
     ):
         dead, duplicates = importer.import_from_file(str(new_file))
@@ -168,12 +179,12 @@ def test_importer_parses_markdown(mock_summary, tmp_path):
             return_value=("Title", "Desc"),
         ),
         patch(
-            "core.importer.BookmarkIntelligence.suggest_categorization",
-            return_value=[("uncategorized.json", 1.0)],
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
         ),
         patch(
-            "core.importer.BookmarkIntelligence.is_duplicate",
-            return_value=None,
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
         ),
     ):
         dead, duplicates = importer.import_from_file(str(new_file))
@@ -200,8 +211,8 @@ def test_importer_parses_plain_list(mock_summary, tmp_path):
             return_value=("Title", "Desc"),
         ),
         patch(
-            "core.importer.BookmarkIntelligence.is_duplicate",
-            return_value=None,
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
         ),
     ):
         dead, duplicates = importer.import_from_file(str(new_file))
@@ -227,10 +238,13 @@ def test_importer_parses_csv(mock_summary, tmp_path):
             "core.importer.WebExtractor.extract_content", return_value=("Title", "Desc")
         ),
         patch(
-            "core.importer.BookmarkIntelligence.suggest_categorization",
-            return_value=[("uncategorized.json", 1.0)],
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
         ),
-        patch("core.importer.BookmarkIntelligence.is_duplicate", return_value=None),
     ):
         dead, duplicates = importer.import_from_file(str(new_file))
 
@@ -238,3 +252,253 @@ def test_importer_parses_csv(mock_summary, tmp_path):
     assert duplicates == []
     bookmarks = BookmarkLoader.load_from_file(str(existing_dir / "uncategorized.json"))
     assert any(b.url == "https://csv.com" for b in bookmarks)
+
+
+def test_parse_markdown_starting_with_bracket(tmp_path):
+    # Looks like JSON at first glance but must fall through to Markdown
+    file_path = tmp_path / "links.md"
+    file_path.write_text("\n[First](https://one.com)\n[Second](https://two.com)\n")
+
+    with patch.object(BookmarkImporter, "__init__", return_value=None):
+        importer = BookmarkImporter(str(tmp_path))
+    bookmarks = importer._parse_new_bookmarks(str(file_path))
+
+    assert [(b.title, b.url) for b in bookmarks] == [
+        ("First", "https://one.com"),
+        ("Second", "https://two.com"),
+    ]
+
+
+@patch.object(BookmarkImporter, "print_summary")
+def test_importer_skips_repeats_within_one_file(mock_summary, tmp_path):
+    existing_dir = tmp_path / "existing"
+    existing_dir.mkdir()
+    BookmarkLoader.save_to_file([], str(existing_dir / "uncategorized.json"))
+
+    new_data = [
+        {"url": "https://same.com", "title": "Same"},
+        {"url": "https://same.com", "title": "Same again"},
+    ]
+    new_file = create_new_file(tmp_path, new_data)
+
+    importer = BookmarkImporter(str(existing_dir))
+    with (
+        patch("core.importer.WebExtractor.is_valid_url", return_value=True),
+        patch(
+            "core.importer.WebExtractor.extract_content",
+            return_value=("Title", "Desc"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
+        ) as mock_batch,
+    ):
+        dead, duplicates = importer.import_from_file(str(new_file))
+
+    mock_batch.assert_called_once()
+    assert dead == []
+    assert len(duplicates) == 1
+    bookmarks = BookmarkLoader.load_from_file(str(existing_dir / "uncategorized.json"))
+    assert [b.url for b in bookmarks] == ["https://same.com"]
+
+
+@patch.object(BookmarkImporter, "print_summary")
+def test_importer_writes_each_target_file_once(mock_summary, tmp_path):
+    existing_dir = tmp_path / "existing"
+    existing_dir.mkdir()
+    BookmarkLoader.save_to_file([], str(existing_dir / "uncategorized.json"))
+
+    new_data = [{"url": f"https://site{i}.com", "title": f"Site {i}"} for i in range(3)]
+    new_file = create_new_file(tmp_path, new_data)
+
+    importer = BookmarkImporter(str(existing_dir))
+    with (
+        patch("core.importer.WebExtractor.is_valid_url", return_value=True),
+        patch(
+            "core.importer.WebExtractor.extract_content",
+            return_value=("Title", "Desc"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            side_effect=_no_duplicates,
+        ),
+        patch.object(
+            importer.loader, "save_to_file", wraps=importer.loader.save_to_file
+        ) as mock_save,
+    ):
+        importer.import_from_file(str(new_file))
+
+    mock_save.assert_called_once()
+    bookmarks = BookmarkLoader.load_from_file(str(existing_dir / "uncategorized.json"))
+    assert [b.url for b in bookmarks] == [f"https://site{i}.com" for i in range(3)]
+
+
+@patch.object(BookmarkImporter, "print_summary")
+def test_importer_fetches_pages_only_for_new_bookmarks(mock_summary, tmp_path):
+    existing_dir = tmp_path / "existing"
+    existing_dir.mkdir()
+    BookmarkLoader.save_to_file([], str(existing_dir / "uncategorized.json"))
+
+    new_data = [
+        {"url": "https://dead.com"},
+        {"url": "https://needs.com"},
+        {"url": "https://known.com"},
+        {"url": "https://full.com", "title": "Full", "description": "Has both"},
+    ]
+    new_file = create_new_file(tmp_path, new_data)
+
+    importer = BookmarkImporter(str(existing_dir))
+    with (
+        patch(
+            "core.importer.WebExtractor.is_valid_url",
+            side_effect=lambda url: url != "https://dead.com",
+        ),
+        patch(
+            "core.importer.WebExtractor.extract_content",
+            return_value=("Title", "Desc"),
+        ) as mock_extract,
+        patch(
+            "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+            side_effect=_suggest("uncategorized.json"),
+        ),
+        patch(
+            "core.importer.BookmarkIntelligence.is_duplicate_batch",
+            return_value=[None, Bookmark(url="https://known.com"), None],
+        ),
+    ):
+        dead, duplicates = importer.import_from_file(str(new_file))
+
+    assert dead == ["https://dead.com"]
+    assert len(duplicates) == 1
+    mock_extract.assert_called_once_with("https://needs.com")
+
+
+def test_parse_netscape_export(tmp_path):
+    file_path = tmp_path / "bookmarks.html"
+    file_path.write_text(
+        "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+        '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+        "<DL><p>\n"
+        '<DT><A HREF="https://one.com" TAGS="a,b">Café <b>One</b></A>\n'
+        '<DT><A HREF="">No link</A>\n'
+        '<DT><a href="https://two.com" data-tags="c">Two</a>\n'
+        "</DL>\n",
+        encoding="utf-8",
+    )
+
+    with patch.object(BookmarkImporter, "__init__", return_value=None):
+        importer = BookmarkImporter(str(tmp_path))
+    bookmarks = importer._parse_new_bookmarks(str(file_path))
+
+    assert [(b.url, b.title, b.tags) for b in bookmarks] == [
+        ("https://one.com", "Café One", ["a", "b"]),
+        ("https://two.com", "Two", ["c"]),
+    ]
+
+
+def test_parse_netscape_export_with_nested_folders(tmp_path):
+    file_path = tmp_path / "bookmarks.html"
+    file_path.write_text(
+        "<!DOCTYPE NETSCAPE-Bookmark-file-1>\n"
+        "<DL><p>\n"
+        '<DT><A HREF="https://top.com">Top</A>\n'
+        "<DT><H3>Folder</H3>\n"
+        "<DL><p>\n"
+        '<DT><A HREF="https://inner1.com">Inner 1</A>\n'
+        "<DT><H3>Sub</H3>\n"
+        '<DL><p><DT><A HREF="https://deep.com">Deep</A></DL><p>\n'
+        '<DT><A HREF="https://inner2.com">Inner 2</A>\n'
+        "</DL><p>\n"
+        '<DT><A HREF="https://last.com">Last</A>\n'
+        "</DL>\n",
+        encoding="utf-8",
+    )
+
+    bookmarks = BookmarkImporter._parse_html_anchors(str(file_path))
+
+    assert [b.url for b in bookmarks] == [
+        "https://top.com",
+        "https://inner1.com",
+        "https://deep.com",
+        "https://inner2.com",
+        "https://last.com",
+    ]
+
+
+def test_parse_netscape_export_beyond_parser_depth_limit(tmp_path):
+    file_path = tmp_path / "bookmarks.html"
+    entries = "".join(
+        f'<DT><A HREF="https://site{i}.com">Site {i}</A>\n' for i in range(600)
+    )
+    file_path.write_text(f"<DL><p>\n{entries}</DL>\n", encoding="utf-8")
+
+    bookmarks = BookmarkImporter._parse_html_anchors(str(file_path))
+
+    assert len(bookmarks) == 600
+    assert bookmarks[-1].url == "https://site599.com"
+
+
+def _topic_embeddings(texts):
+    """Two-topic stand-in embeddings: Python texts versus everything else."""
+    return [[1.0, 0.0] if "python" in t.lower() else [0.0, 1.0] for t in texts]
+
+
+@pytest.mark.parametrize("check_duplicates", [True, False])
+def test_import_files_links_by_similar_existing_bookmarks(tmp_path, check_duplicates):
+    existing_dir = tmp_path / "existing"
+    existing_dir.mkdir()
+    BookmarkLoader.save_to_file(
+        [
+            Bookmark(
+                url=f"https://python{i}.org",
+                title=f"Python guide {i}",
+                description="Python tutorial",
+                tags=["python"],
+            )
+            for i in range(3)
+        ],
+        str(existing_dir / "python.json"),
+    )
+    BookmarkLoader.save_to_file(
+        [
+            Bookmark(
+                url="https://recipes.com",
+                title="Recipes",
+                description="Cooking ideas",
+                tags=["food"],
+            )
+        ],
+        str(existing_dir / "cooking.json"),
+    )
+    new_file = tmp_path / "new.md"
+    new_file.write_text(
+        "\n".join(f"- [Python link {i}](https://new{i}.dev)" for i in range(40))
+    )
+
+    with (
+        patch(
+            "core.vector_store.VectorStore.get_cached_embeddings",
+            side_effect=_topic_embeddings,
+        ),
+        patch("core.importer.WebExtractor.is_valid_url", return_value=True),
+        patch("core.importer.WebExtractor.extract_content", return_value=("", "")),
+    ):
+        importer = BookmarkImporter(str(existing_dir))
+        dead, duplicates = importer.import_from_file(
+            str(new_file), check_duplicates=check_duplicates
+        )
+
+    assert dead == [] and duplicates == []
+    assert not (existing_dir / "uncategorized.json").exists()
+    filed = BookmarkLoader.load_from_file(str(existing_dir / "python.json"))
+    assert len(filed) == 43
+    stored = importer.intelligence.vector_store.collection.get(include=["metadatas"])
+    assert all(meta["source_file"] for meta in stored["metadatas"])
@@ -28,6 +28,12 @@ class TestBookmarkIntelligence:
         assert intelligence.loader is not None
         assert intelligence.vector_store is not None
 
+    def test_embedding_batch_size_reaches_vector_store(self):
+        """Test the embedding batch size is passed to the vector store."""
+        intelligence = BookmarkIntelligence(embedding_batch_size=8)
+
+        assert intelligence.vector_store.embedding_batch_size == 8
+
     def test_load_bookmarks_from_file(self, temp_json_file):
         """Test loading bookmarks from a single file."""
         intelligence = BookmarkIntelligence()
@@ -49,6 +55,33 @@ class TestBookmarkIntelligence:
         assert result is True
         assert len(intelligence.bookmarks) == 3  # 2 from file1 + 1 from file2
 
+    def test_load_bookmarks_uses_collection_per_input(
+        self, temp_json_file, temp_directory
+    ):
+        """Test each input path is indexed in its own collection."""
+        intelligence = BookmarkIntelligence()
+
+        intelligence.load_bookmarks(temp_json_file)
+        file_collection = intelligence.vector_store.collection_name
+        intelligence.indexed = True
+        intelligence.load_bookmarks(temp_directory)
+
+        assert file_collection.startswith("bookmarks_intelligence_")
+        assert intelligence.vector_store.collection_name != file_collection
+        assert intelligence.indexed is False
+
+    @patch("core.intelligence.VectorStore")
+    def test_ensure_indexed_clears_when_no_bookmarks(self, mock_vector_store):
+        """Test an empty collection still syncs so stale vectors are dropped."""
+        mock_vector_store_instance = Mock()
+        mock_vector_store_instance.rebuild_from_bookmarks.return_value = True
+        mock_vector_store.return_value = mock_vector_store_instance
+
+        intelligence = BookmarkIntelligence()
+
+        assert intelligence._ensure_indexed() is True
+        mock_vector_store_instance.rebuild_from_bookmarks.assert_called_once_with([])
+
     def test_load_bookmarks_nonexistent_path(self):
         """Test loading bookmarks from nonexistent path."""
         intelligence = BookmarkIntelligence()
@@ -268,6 +301,129 @@ class TestDuplicateDetection:
         assert duplicates[0].reason == "similar_title"
         assert len(duplicates[0].bookmarks) == 3
 
+    def test_is_duplicate_matches_url_and_title(self):
+        """Test exact URL and normalized title matches without vector search."""
+        first = Bookmark(url="https://example.com", title="Example Title")
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [
+            first,
+            Bookmark(url="https://example.com", title="Second copy"),
+        ]
+
+        with patch.object(intelligence, "_ensure_indexed") as mock_indexed:
+            by_url = intelligence.is_duplicate(Bookmark(url="https://example.com"))
+            by_title = intelligence.is_duplicate(
+                Bookmark(url="https://other.com", title="  EXAMPLE title ")
+            )
+
+        assert by_url is first
+        assert by_title is first
+        mock_indexed.assert_not_called()
+
+    def test_is_duplicate_sees_added_and_replaced_bookmarks(self):
+        """Test the lookup indexes follow add_bookmark and reassignment."""
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [Bookmark(url="https://old.com", title="Old")]
+        new = Bookmark(url="https://new.com", title="New")
+
+        assert intelligence.is_duplicate(new) is None
+        intelligence.add_bookmark(new)
+        assert intelligence.is_duplicate(Bookmark(url="https://new.com")) is new
+
+        intelligence.bookmarks = []
+        assert intelligence.is_duplicate(Bookmark(url="https://new.com")) is None
+
+    def test_is_duplicate_batch_uses_one_vector_search(self):
+        """Test batched duplicate checks embed all queries in one call."""
+        existing = Bookmark(url="https://example.com", title="Example")
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [existing]
+
+        vectors = {
+            existing.search_text: [1.0, 0.0],
+            "A close match": [1.0, 0.1],
+            "C far away": [0.0, 1.0],
+        }
+        new = [
+            Bookmark(url="https://example.com"),
+            Bookmark(url="https://a.com", title="A", description="close match"),
+            Bookmark(url="https://b.com", title="B"),
+            Bookmark(url="https://c.com", title="C", description="far away"),
+        ]
+
+        with patch.object(
+            intelligence.vector_store,
+            "get_cached_embeddings",
+            side_effect=lambda texts: [vectors[text] for text in texts],
+        ) as mock_embed:
+            matches = intelligence.is_duplicate_batch(new)
+
+        assert matches == [existing, existing, None, None]
+        assert mock_embed.call_count == 2  # collection once, then all queries
+        mock_embed.assert_called_with(["A close match", "C far away"])
+
+    def test_index_new_bookmarks_embeds_only_new_ones(self):
+        """Test imported bookmarks extend the built indexes incrementally."""
+        existing = Bookmark(url="https://old.com", title="Old")
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [existing]
+
+        vectors = {
+            existing.search_text: [1.0, 0.0],
+            "New": [0.0, 1.0],
+            "Query near new": [0.0, 1.0],
+        }
+        with (
+            patch.object(
+                intelligence.vector_store,
+                "get_cached_embeddings",
+                side_effect=lambda texts: [vectors[text] for text in texts],
+            ) as mock_embed,
+            patch.object(
+                intelligence.vector_store,
+                "add_bookmarks",
+                wraps=intelligence.vector_store.add_bookmarks,
+            ) as mock_add,
+        ):
+            assert intelligence._ensure_indexed()
+            new = Bookmark(url="https://new.com", title="New")
+            intelligence.add_bookmark(new)
+            intelligence.index_new_bookmarks([new])
+            match = intelligence.is_duplicate(
+                Bookmark(url="https://x.com", title="Query", description="near new")
+            )
+
+        assert match is new
+        mock_add.assert_called_with([new])  # after the initial rebuild
+        assert mock_embed.call_args_list[1].args == (["New"],)
+
+    def test_remove_bookmarks_stop_matching_without_reembedding(self):
+        """Test removed bookmarks stop matching and nothing is re-embedded."""
+        keep = Bookmark(url="https://keep.com", title="Keep")
+        drop = Bookmark(url="https://drop.com", title="Drop")
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [keep, drop]
+
+        vectors = {"Keep": [1.0, 0.0], "Drop": [0.0, 1.0], "Q near drop": [0.0, 1.0]}
+        with patch.object(
+            intelligence.vector_store,
+            "get_embeddings_batch",
+            side_effect=lambda texts: [vectors[text] for text in texts],
+        ) as mock_embed:
+            assert intelligence._ensure_indexed()
+            intelligence.remove_bookmarks([drop])
+            match = intelligence.is_duplicate(
+                Bookmark(url="https://q.com", title="Q", description="near drop")
+            )
+
+        assert intelligence.bookmarks == [keep]
+        assert (
+            intelligence.find_exact_duplicate(Bookmark(url="https://drop.com")) is None
+        )
+        assert match is None
+        assert mock_embed.call_count == 2  # collection once, then the query
+        assert intelligence.vector_store.collection.count() == 1
+
 
 class TestCollectionAnalysis:
     """Test collection analysis functionality."""
@@ -372,6 +528,32 @@ class TestAutoCategorization:
         assert suggestions[0][0] == "test.json"  # source_file from sample bookmarks
         assert 0 < suggestions[0][1] <= 1  # confidence score
 
+    @patch("core.intelligence.VectorStore")
+    def test_suggest_categorization_zero_scores(self, mock_vector_store):
+        """Test all-zero similarity scores do not divide by zero."""
+        mock_search_result = SearchResult(
+            query="test",
+            similar_bookmarks=[
+                SimilarBookmark(
+                    Bookmark(url="https://a.com", source_file="a.json"), 0.0, "a"
+                ),
+            ],
+            total_results=1,
+        )
+        mock_vector_store_instance = Mock()
+        mock_vector_store_instance.rebuild_from_bookmarks.return_value = True
+        mock_vector_store_instance.search.return_value = mock_search_result
+        mock_vector_store.return_value = mock_vector_store_instance
+
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [Bookmark(url="https://a.com", title="A")]
+
+        suggestions = intelligence.suggest_categorization(
+            Bookmark(url="https://new.com", title="New")
+        )
+
+        assert suggestions == [("a.json", 0.0)]
+
     @patch("core.intelligence.VectorStore")
     def test_suggest_categorization_no_similar(self, mock_vector_store):
         """Test categorization when no similar bookmarks found."""
@@ -440,6 +622,36 @@ class TestAutoCategorization:
         for filename, confidence in suggestions:
             assert 0 <= confidence <= 1
 
+    @patch("core.intelligence.VectorStore")
+    def test_suggest_categorization_batch(self, mock_vector_store):
+        """Test batch suggestions use one search call and keep input order."""
+        python = Bookmark(url="https://python.org", source_file="python.json")
+        tools = Bookmark(url="https://github.com", source_file="tools.json")
+        mock_vector_store_instance = Mock()
+        mock_vector_store_instance.rebuild_from_bookmarks.return_value = True
+        mock_vector_store_instance.search_batch.return_value = [
+            SearchResult("a", [SimilarBookmark(python, 0.9, "content")], 1),
+            SearchResult("b", [], 0),
+            SearchResult("c", [SimilarBookmark(tools, 0.5, "content")], 1),
+        ]
+        mock_vector_store.return_value = mock_vector_store_instance
+
+        intelligence = BookmarkIntelligence()
+        intelligence.bookmarks = [python, tools]
+
+        new_bookmarks = [
+            Bookmark(url="https://a.com", title="A"),
+            Bookmark(url="https://b.com", title="B"),
+            Bookmark(url="https://c.com", title="C"),
+        ]
+        suggestions = intelligence.suggest_categorization_batch(new_bookmarks, 1)
+
+        assert suggestions == [[("python.json", 1.0)], [], [("tools.json", 1.0)]]
+        mock_vector_store_instance.search_batch.assert_called_once_with(
+            ["A", "B", "C"], n_results=10
+        )
+        mock_vector_store_instance.search.assert_not_called()
+
     @patch("core.intelligence.VectorStore")
     def test_suggest_categorization_indexing_failure(self, mock_vector_store):
         """Test categorization when indexing fails."""
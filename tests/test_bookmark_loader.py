@@ -7,6 +7,7 @@ import json
 import os
 import csv
 import tempfile
+from unittest.mock import patch
 from core.bookmark_loader import BookmarkLoader
 from core.models import Bookmark
 
@@ -75,6 +76,24 @@ class TestBookmarkLoader:
         assert "file1.json" in source_files
         assert "file2.json" in source_files
 
+    def test_load_from_directory_keeps_file_order(self, tmp_path):
+        """Test threaded directory loading preserves sorted file order."""
+        for i in reversed(range(6)):
+            data = [
+                {"url": f"https://site{i}.com/{j}", "title": f"{i}-{j}"}
+                for j in range(3)
+            ]
+            (tmp_path / f"file{i}.json").write_text(json.dumps(data))
+
+        with patch("core.bookmark_loader.PARALLEL_LOAD_MIN_BYTES", 0):
+            bookmarks = BookmarkLoader.load_from_directory(str(tmp_path))
+
+        assert [b.title for b in bookmarks] == [
+            f"{i}-{j}" for i in range(6) for j in range(3)
+        ]
+        assert bookmarks[0].source_file == "file0.json"
+        assert bookmarks[-1].source_file == "file5.json"
+
     def test_load_nonexistent_file(self):
         """Test loading from nonexistent file."""
         bookmarks = BookmarkLoader.load_from_file("nonexistent.json")
@@ -101,12 +120,78 @@ class TestBookmarkLoader:
         assert data[0]["url"] == "https://python.org"
         assert data[0]["title"] == "Python.org"
 
+    def test_save_to_file_skips_unchanged(self, sample_bookmarks, tmp_path):
+        """Test identical content isn't rewritten and no temp file is left."""
+        output_file = tmp_path / "output.json"
+        assert BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+        os.utime(output_file, (0, 0))
+
+        assert BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+        assert output_file.stat().st_mtime == 0
+
+        sample_bookmarks[0].title = "Changed"
+        assert BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+        assert output_file.stat().st_mtime != 0
+        assert json.loads(output_file.read_text())[0]["title"] == "Changed"
+        assert os.listdir(tmp_path) == ["output.json"]
+
+    def test_save_to_file_removes_temp_file_on_failure(
+        self, sample_bookmarks, tmp_path
+    ):
+        """Test a failed swap leaves neither a temp file nor a partial file."""
+        output_file = tmp_path / "output.json"
+
+        with patch("core.bookmark_loader.os.replace", side_effect=OSError("disk")):
+            assert not BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+
+        assert os.listdir(tmp_path) == []
+
+    def test_save_to_file_new_file_mode(self, sample_bookmarks, tmp_path):
+        """Test a new file gets the usual umask-based mode, not 0600."""
+        umask = os.umask(0o027)
+        try:
+            output_file = tmp_path / "output.json"
+            BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+        finally:
+            os.umask(umask)
+
+        assert output_file.stat().st_mode & 0o777 == 0o640
+
+    def test_save_to_file_keeps_existing_mode(self, sample_bookmarks, tmp_path):
+        """Test rewriting a file keeps its permissions."""
+        output_file = tmp_path / "output.json"
+        output_file.write_text("[]")
+        output_file.chmod(0o600)
+
+        assert BookmarkLoader.save_to_file(sample_bookmarks, str(output_file))
+        assert output_file.stat().st_mode & 0o777 == 0o600
+
     def test_load_from_csv(self, temp_csv_file):
         bookmarks = BookmarkLoader.load_from_file(temp_csv_file)
 
         assert len(bookmarks) == 3
         assert bookmarks[0].url == "https://python.org"
 
+    def test_load_from_csv_column_variants(self, tmp_path):
+        """Test link/description columns and short rows in CSV exports."""
+        csv_file = tmp_path / "export.csv"
+        csv_file.write_text(
+            "link,title,description,tags\n"
+            'https://a.com,A,Desc A,"x, y"\n'
+            "https://b.com\n"
+            ",No URL,,\n",
+            encoding="utf-8",
+        )
+
+        bookmarks = BookmarkLoader.load_from_file(str(csv_file))
+
+        assert [b.url for b in bookmarks] == ["https://a.com", "https://b.com"]
+        assert bookmarks[0].description == "Desc A"
+        assert bookmarks[0].tags == ["x", "y"]
+        assert bookmarks[1].title == ""
+        assert bookmarks[1].bookmark_type == "link"
+        assert bookmarks[1].source_file == "export.csv"
+
     def test_save_to_csv(self, sample_bookmarks, tmp_path):
         output_file = tmp_path / "out.csv"
 
@@ -164,6 +249,14 @@ class TestBookmarkLoader:
         assert len(unenriched) == 2  # Only the sample_unenriched_bookmarks
         assert all(not b.is_enriched for b in unenriched)
 
+    def test_partition_enriched(self, sample_bookmarks, sample_unenriched_bookmarks):
+        """Test splitting bookmarks into enriched and unenriched lists."""
+        all_bookmarks = sample_unenriched_bookmarks + sample_bookmarks
+        enriched, unenriched = BookmarkLoader.partition_enriched(all_bookmarks)
+
+        assert enriched == sample_bookmarks
+        assert unenriched == sample_unenriched_bookmarks
+
     def test_get_stats(self, sample_bookmarks, sample_unenriched_bookmarks):
         """Test getting bookmark statistics."""
         all_bookmarks = sample_bookmarks + sample_unenriched_bookmarks
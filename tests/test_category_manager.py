@@ -7,7 +7,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from core.category_manager import CategoryManager
+from core.category_manager import CategoryManager, sanitize_category_name
 from core.models import Bookmark, SearchResult, SimilarBookmark
 
 
@@ -278,8 +278,6 @@ class TestCategoryManagerMoveBookmarks:
     ):
         """Test successful bookmark moving."""
         # Setup mocks - target category doesn't exist yet
-        mock_loader.load_from_file.return_value = []
-        mock_loader.save_to_file.return_value = True
         mock_loader.save_by_source_file.return_value = True
 
         bookmarks_to_move = [sample_bookmarks[0]]
@@ -291,21 +289,20 @@ class TestCategoryManagerMoveBookmarks:
 
         assert result is True
 
-        # Verify bookmark was removed from main list
-        assert sample_bookmarks[0] not in all_bookmarks
+        # Moved bookmark stays in the list, relabelled to the target file
+        assert all_bookmarks == sample_bookmarks
+        assert sample_bookmarks[0].source_file == "3d-printing.json"
 
-        # Verify save methods were called
-        expected_target_path = os.path.join(temp_dir, "3d-printing.json")
-        mock_loader.save_to_file.assert_called_once_with(
-            [sample_bookmarks[0]], expected_target_path
-        )
+        # Every file is written through a single save_by_source_file call
+        mock_loader.load_from_file.assert_not_called()
+        mock_loader.save_to_file.assert_not_called()
         mock_loader.save_by_source_file.assert_called_once_with(all_bookmarks, temp_dir)
 
     def test_move_bookmarks_existing_target_category(
         self, category_manager, mock_loader, temp_dir, sample_bookmarks
     ):
-        """Test moving bookmarks to existing category file."""
-        # Setup - target category already has bookmarks
+        """Test moving bookmarks to a category file that wasn't loaded."""
+        # Setup - target category already has bookmarks on disk
         existing_bookmark = Bookmark(
             url="https://existing.com", title="Existing", description=""
         )
@@ -315,7 +312,6 @@ class TestCategoryManagerMoveBookmarks:
         with patch("os.path.exists") as mock_exists:
             mock_exists.return_value = True
             mock_loader.load_from_file.return_value = [existing_bookmark]
-            mock_loader.save_to_file.return_value = True
             mock_loader.save_by_source_file.return_value = True
 
             bookmarks_to_move = [sample_bookmarks[0]]
@@ -328,17 +324,38 @@ class TestCategoryManagerMoveBookmarks:
             assert result is True
 
             # Verify both existing and new bookmarks were saved
-            expected_target_bookmarks = [existing_bookmark, sample_bookmarks[0]]
-            mock_loader.save_to_file.assert_called_once_with(
-                expected_target_bookmarks, expected_target_path
+            mock_loader.load_from_file.assert_called_once_with(expected_target_path)
+            assert existing_bookmark.source_file == "3d-printing.json"
+            mock_loader.save_by_source_file.assert_called_once_with(
+                all_bookmarks + [existing_bookmark], temp_dir
             )
 
+    def test_move_bookmarks_target_already_loaded(
+        self, category_manager, mock_loader, temp_dir, sample_bookmarks
+    ):
+        """Test the target file isn't re-read when its bookmarks are in memory."""
+        mock_loader.save_by_source_file.return_value = True
+        target_path = os.path.join(temp_dir, "development.json")
+        with open(target_path, "w") as f:
+            json.dump([{"url": sample_bookmarks[2].url}], f)
+
+        all_bookmarks = sample_bookmarks.copy()
+        result = category_manager.move_bookmarks_to_category(
+            [sample_bookmarks[0]], "development", all_bookmarks, temp_dir
+        )
+
+        assert result is True
+        mock_loader.load_from_file.assert_not_called()
+        assert [b.source_file for b in all_bookmarks] == [
+            "development.json",
+            "hardware.json",
+            "development.json",
+        ]
+
     def test_move_bookmarks_add_json_extension(
         self, category_manager, mock_loader, temp_dir, sample_bookmarks
     ):
         """Test that .json extension is added if missing."""
-        mock_loader.load_from_file.return_value = []
-        mock_loader.save_to_file.return_value = True
         mock_loader.save_by_source_file.return_value = True
 
         # Use the specific bookmark for this test
@@ -353,11 +370,45 @@ class TestCategoryManagerMoveBookmarks:
         )
 
         assert result is True
+        assert sample_bookmarks[1].source_file == "3d-printing.json"
 
-        # Verify .json was added to the path
-        expected_target_path = os.path.join(temp_dir, "3d-printing.json")
+    def test_move_bookmarks_matches_rebuilt_candidates(
+        self, category_manager, mock_loader, temp_dir, sample_bookmarks
+    ):
+        """Test candidates rebuilt from search metadata update the originals."""
+        mock_loader.save_by_source_file.return_value = True
+
+        # Search results carry no description, so they don't compare equal
+        rebuilt = Bookmark(
+            url=sample_bookmarks[0].url,
+            title=sample_bookmarks[0].title,
+            source_file=sample_bookmarks[0].source_file,
+        )
+        all_bookmarks = sample_bookmarks.copy()
+
+        result = category_manager.move_bookmarks_to_category(
+            [rebuilt], "3d-printing", all_bookmarks, temp_dir
+        )
+
+        assert result is True
+        assert all_bookmarks == sample_bookmarks
+        assert sample_bookmarks[0].source_file == "3d-printing.json"
+        assert sample_bookmarks[0].description == "Guide to choosing 3D printers"
+
+    def test_move_bookmarks_empties_source_file(
+        self, category_manager, mock_loader, temp_dir, sample_bookmarks
+    ):
+        """Test a source file left without bookmarks is rewritten as empty."""
+        mock_loader.save_by_source_file.return_value = True
+        mock_loader.save_to_file.return_value = True
+
+        result = category_manager.move_bookmarks_to_category(
+            [sample_bookmarks[2]], "python", sample_bookmarks, temp_dir
+        )
+
+        assert result is True
         mock_loader.save_to_file.assert_called_once_with(
-            bookmarks_to_move, expected_target_path
+            [], os.path.join(temp_dir, "development.json")
         )
 
     def test_move_bookmarks_empty_list(self, category_manager, mock_loader, temp_dir):
@@ -373,8 +424,7 @@ class TestCategoryManagerMoveBookmarks:
         self, category_manager, mock_loader, temp_dir, sample_bookmarks
     ):
         """Test handling when saving fails."""
-        mock_loader.load_from_file.return_value = []
-        mock_loader.save_to_file.return_value = False  # Simulate save failure
+        mock_loader.save_by_source_file.return_value = False  # Simulate failure
 
         result = category_manager.move_bookmarks_to_category(
             [sample_bookmarks[0]], "test", sample_bookmarks, temp_dir
@@ -492,3 +542,9 @@ class TestCategoryManagerInteractive:
             )
 
         assert result is True
+
+
+def test_sanitize_category_name():
+    assert sanitize_category_name("Web Dev") == "web_dev"
+    assert sanitize_category_name('CI/CD: "Tools"?') == "ci_cd___tools__"
+    assert sanitize_category_name("../Secrets") == ".._secrets"
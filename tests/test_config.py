@@ -4,6 +4,9 @@ Tests for configuration management.
 
 import os
 import tempfile
+from unittest.mock import patch
+
+from core import config_manager
 from core.config_manager import (
     BookmarkConfig,
     ModelConfig,
@@ -97,6 +100,25 @@ class TestBookmarkConfig:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
 
+    def test_load_reuses_parsed_file_until_it_changes(self, tmp_path):
+        """Test repeated loads parse an unchanged file only once."""
+        config_path = tmp_path / "bookmark_config.yaml"
+        config_path.write_text("models:\n  llm: first\n", encoding="utf-8")
+
+        with patch(
+            "core.config_manager.yaml.load", wraps=config_manager.yaml.load
+        ) as mock_load:
+            first = BookmarkConfig.load_from_file(str(config_path))
+            first.models.llm = "mutated"
+            second = BookmarkConfig.load_from_file(str(config_path))
+
+            config_path.write_text("models:\n  llm: second-model\n", encoding="utf-8")
+            third = BookmarkConfig.load_from_file(str(config_path))
+
+        assert mock_load.call_count == 2
+        assert second.models.llm == "first"
+        assert third.models.llm == "second-model"
+
     def test_load_nonexistent_file(self):
         """Test loading non-existent configuration file."""
         config = BookmarkConfig.load_from_file("nonexistent.yaml")
@@ -159,6 +181,7 @@ class TestProcessingConfig:
         config = ProcessingConfig()
 
         assert config.batch_size == 50
+        assert config.embedding_batch_size == 32
         assert config.delay_between_requests == 0.5
         assert config.max_retries == 3
         assert config.timeout == 10
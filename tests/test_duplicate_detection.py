@@ -6,6 +6,11 @@ from core.bookmark_loader import BookmarkLoader
 from core.models import Bookmark
 
 
+def _suggest(filename):
+    """Stand-in for suggest_categorization_batch that picks one file."""
+    return lambda bookmarks, *args, **kwargs: [[(filename, 1.0)] for _ in bookmarks]
+
+
 def create_test_file(tmp_path, data):
     file_path = tmp_path / "test.json"
     with open(file_path, "w") as f:
@@ -114,8 +119,8 @@ def test_no_duplicates_allows_import(tmp_path):
                 return_value=("Different Site", "Another test site"),
             ),
             patch(
-                "core.importer.BookmarkIntelligence.suggest_categorization",
-                return_value=[("existing.json", 1.0)],
+                "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+                side_effect=_suggest("existing.json"),
             ),
         ):
             dead, duplicates = importer.import_from_file(str(new_file))
@@ -160,8 +165,8 @@ def test_skip_duplicate_check_option(tmp_path):
                 return_value=("Same Site", "Same description"),
             ),
             patch(
-                "core.importer.BookmarkIntelligence.suggest_categorization",
-                return_value=[("existing.json", 1.0)],
+                "core.importer.BookmarkIntelligence.suggest_categorization_batch",
+                side_effect=_suggest("existing.json"),
             ),
         ):
             dead, duplicates = importer.import_from_file(
@@ -0,0 +1,66 @@
+"""Tests for the on-disk embedding cache."""
+
+import numpy as np
+
+from core.embedding_cache import EmbeddingCache
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = EmbeddingCache("nomic-embed-text", cache_dir=str(tmp_path))
+
+    assert cache.get("hello") is None
+
+    cache.put("hello", [0.1, 0.2, 0.3])
+    vector = cache.get("hello")
+
+    assert vector is not None
+    assert vector.dtype == np.float32
+    np.testing.assert_allclose(vector, [0.1, 0.2, 0.3], rtol=1e-6)
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    EmbeddingCache("model-a", cache_dir=str(tmp_path)).put("hello", [1.0])
+
+    assert EmbeddingCache("model-b", cache_dir=str(tmp_path)).get("hello") is None
+
+
+def test_cache_uses_env_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOOKMARKS_CACHE_DIR", str(tmp_path))
+    cache = EmbeddingCache("model")
+
+    assert cache.directory.startswith(str(tmp_path))
+
+
+def test_get_many_splits_hits_and_misses(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    cache.put_many(["a", "b", "zero"], [[1.0, 2.0], [3.0, 4.0], [0.0, 0.0]])
+
+    hits, misses = cache.get_many(["b", "new", "a", "zero"])
+
+    assert sorted(hits) == [0, 2]
+    np.testing.assert_allclose(hits[0], [3.0, 4.0])
+    # All-zero vectors are failure fallbacks and are never cached
+    assert misses == [1, 3]
+
+
+def test_cache_persists_across_instances(tmp_path):
+    EmbeddingCache("model", cache_dir=str(tmp_path)).put("hello", [0.5, 0.25])
+
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    vector = cache.get("hello")
+    cache.close()
+
+    assert cache.path.startswith(str(tmp_path))
+    np.testing.assert_allclose(vector, [0.5, 0.25])
+
+
+def test_cache_evicts_oldest_entries(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path), max_entries=2)
+    cache.put_many(["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    cache.close()
+
+    reopened = EmbeddingCache("model", cache_dir=str(tmp_path), max_entries=2)
+    hits, misses = reopened.get_many(["a", "b", "c"])
+
+    assert misses == [0]
+    assert sorted(hits) == [1, 2]
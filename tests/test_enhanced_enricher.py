@@ -22,6 +22,8 @@ class TestURLValidation:
             "https://example.com:8080",
             "https://192.168.1.1",
             "http://localhost",
+            "HTTPS://Example.com",  # Scheme is case-insensitive
+            "  ftp://files.example.com  ",
         ]
 
         for url in valid_urls:
@@ -37,6 +39,8 @@ class TestURLValidation:
             "https://",  # Missing domain
             "https://.com",  # Invalid domain
             "https://example",  # No TLD
+            "mailto:user@example.com",  # Unsupported scheme
+            "http:example.com",  # No authority
         ]
 
         for url in invalid_urls:
@@ -50,6 +54,9 @@ class TestURLValidation:
         assert valid_bookmark.is_valid_url
         assert not invalid_bookmark.is_valid_url
 
+        invalid_bookmark.url = "https://example.org"
+        assert invalid_bookmark.is_valid_url
+
 
 class TestBookmarkConfig:
     """Test bookmark configuration integration."""
@@ -1,8 +1,15 @@
 from contextlib import contextmanager
 from unittest.mock import patch, Mock
 
-from core.enricher import BookmarkEnricher
-from core.models import Bookmark
+from core.enricher import (
+    BookmarkEnricher,
+    BoundedLog,
+    ProcessingSummary,
+    SummaryAwareWebExtractor,
+)
+from core.bookmark_loader import BookmarkLoader
+from core.models import Bookmark, SearchResult
+from core.vector_store import VectorStore
 
 
 @contextmanager
@@ -10,6 +17,12 @@ def no_spinner(*args, **kwargs):
     yield
 
 
+def _no_matches(queries, n_results=10):
+    return [
+        SearchResult(query=q, similar_bookmarks=[], total_results=0) for q in queries
+    ]
+
+
 def _make_stub(bookmark: Bookmark) -> Bookmark:
     bookmark.description = "desc"
     bookmark.tags = ["tag"]
@@ -18,11 +31,13 @@ def _make_stub(bookmark: Bookmark) -> Bookmark:
 
 def test_process_bookmarks_limit(mixed_enrichment_bookmarks):
     enricher = BookmarkEnricher()
-    enricher.vector_store.rebuild_from_bookmarks = Mock(return_value=True)
+    enricher.vector_store.sync_bookmarks = Mock(return_value=True)
+    enricher.vector_store.search_batch = Mock(side_effect=_no_matches)
 
     with (
         patch("core.enricher.Spinner", no_spinner),
-        patch("core.enricher.time.sleep"),
+        patch("core.web_extractor.time.sleep"),
+        patch.object(enricher.web_extractor, "extract_content", return_value=("", "")),
         patch.object(
             enricher, "enrich_bookmark", side_effect=_make_stub
         ) as mock_enrich,
@@ -47,11 +62,11 @@ def test_process_directory_limit(mixed_enrichment_bookmarks):
         patch.object(
             enricher.loader, "save_by_source_file", return_value=True
         ) as mock_save,
-        patch.object(
-            enricher.vector_store, "rebuild_from_bookmarks", return_value=True
-        ),
+        patch.object(enricher.vector_store, "sync_bookmarks", return_value=True),
+        patch.object(enricher.vector_store, "search_batch", side_effect=_no_matches),
         patch("core.enricher.Spinner", no_spinner),
-        patch("core.enricher.time.sleep"),
+        patch("core.web_extractor.time.sleep"),
+        patch.object(enricher.web_extractor, "extract_content", return_value=("", "")),
         patch.object(
             enricher, "enrich_bookmark", side_effect=_make_stub
         ) as mock_enrich,
@@ -62,3 +77,177 @@ def test_process_directory_limit(mixed_enrichment_bookmarks):
     assert mock_enrich.call_count == 1
     assert mixed_enrichment_bookmarks[2].description == "desc"
     assert mixed_enrichment_bookmarks[3].description == "Test site"
+
+
+def test_prefetched_web_content_is_used(mixed_enrichment_bookmarks):
+    enricher = BookmarkEnricher()
+    enricher.vector_store.sync_bookmarks = Mock(return_value=True)
+    enricher.vector_store.search = Mock()
+    enricher.vector_store.search_batch = Mock(side_effect=_no_matches)
+
+    with (
+        patch("core.enricher.Spinner", no_spinner),
+        patch.object(
+            enricher.web_extractor,
+            "extract_content",
+            side_effect=lambda url: ("Fetched", f"About {url}"),
+        ) as mock_extract,
+        patch.object(enricher, "_generate_enrichment", return_value=None),
+    ):
+        enricher._process_bookmarks(mixed_enrichment_bookmarks)
+
+    # Only bookmarks missing a title or content are fetched, once each
+    fetched = sorted(call.args[0] for call in mock_extract.call_args_list)
+    assert fetched == ["https://example.com", "https://incomplete.com"]
+    assert mixed_enrichment_bookmarks[2].excerpt == "About https://example.com"
+    assert mixed_enrichment_bookmarks[4].title == "Fetched"
+    assert enricher._prefetched_web == {}
+
+    # Context for every bookmark came from one batched search
+    enricher.vector_store.search_batch.assert_called_once()
+    queries = enricher.vector_store.search_batch.call_args.args[0]
+    assert queries == [
+        "Example About https://example.com",
+        "Test Test site",
+        "Fetched About https://incomplete.com",
+    ]
+    enricher.vector_store.search.assert_not_called()
+    assert enricher._prefetched_search == {}
+
+
+def test_context_does_not_leak_between_input_files(tmp_path):
+    file_a = tmp_path / "a.json"
+    file_b = tmp_path / "b.json"
+    BookmarkLoader.save_to_file(
+        [
+            Bookmark(
+                url="https://a.example/1",
+                title="A one",
+                description="First A page",
+                tags=["a"],
+            ),
+            Bookmark(
+                url="https://a.example/2",
+                title="A two",
+                description="Second A page",
+                tags=["a"],
+            ),
+        ],
+        str(file_a),
+    )
+    BookmarkLoader.save_to_file(
+        [Bookmark(url="https://b.example/1", title="B one")], str(file_b)
+    )
+
+    found = []
+
+    def run(path):
+        enricher = BookmarkEnricher()
+        search_batch = enricher.vector_store.search_batch
+
+        def recording_search(queries, n_results=10):
+            results = search_batch(queries, n_results=n_results)
+            found.extend(
+                similar.bookmark.url
+                for result in results
+                for similar in result.similar_bookmarks
+            )
+            return results
+
+        with (
+            patch.object(
+                VectorStore,
+                "get_cached_embeddings",
+                side_effect=lambda texts: [[0.1] * 768 for _ in texts],
+            ),
+            patch.object(
+                enricher.vector_store, "search_batch", side_effect=recording_search
+            ),
+            patch("core.enricher.Spinner", no_spinner),
+            patch.object(
+                enricher.web_extractor, "extract_content", return_value=("", "")
+            ),
+            patch.object(enricher, "enrich_bookmark", side_effect=_make_stub),
+        ):
+            enricher.process_single_file(
+                str(path),
+                output_file=str(tmp_path / f"out_{path.name}"),
+                output_format="json",
+            )
+        return enricher
+
+    run(file_a)
+    enricher = run(file_b)
+
+    # File B has nothing enriched, so there is no context to offer
+    assert found == []
+    assert enricher.vector_store.collection.count() == 0
+
+
+def test_generate_enrichment_requests_json(mixed_enrichment_bookmarks):
+    enricher = BookmarkEnricher()
+    response = {"response": '{"description": "A site", "tags": ["web"]}'}
+
+    with (
+        patch("core.enricher.Spinner", no_spinner),
+        patch.object(
+            enricher.ollama_client, "generate", return_value=response
+        ) as mock_gen,
+    ):
+        result = enricher._generate_enrichment(mixed_enrichment_bookmarks[2], "")
+
+    assert result == {"description": "A site", "tags": ["web"]}
+    assert mock_gen.call_args.kwargs["format"] == "json"
+
+
+def test_generate_enrichment_rejects_non_object(mixed_enrichment_bookmarks):
+    enricher = BookmarkEnricher()
+
+    with (
+        patch("core.enricher.Spinner", no_spinner),
+        patch.object(
+            enricher.ollama_client, "generate", return_value={"response": "not json"}
+        ),
+    ):
+        result = enricher._generate_enrichment(mixed_enrichment_bookmarks[2], "")
+
+    assert result is None
+    assert len(enricher.summary.enrichment_failures) == 0
+
+
+def test_bounded_log_keeps_newest_entries_and_exact_total():
+    log = BoundedLog(maxlen=2)
+    for message in ["a", "b", "c"]:
+        log.append(message)
+
+    assert len(log) == 3
+    assert log.omitted == 1
+    assert list(log) == ["b", "c"]
+
+
+def test_summary_counts_successes_without_keeping_titles(capsys):
+    summary = ProcessingSummary()
+    summary.errors = BoundedLog(maxlen=1)
+    summary.add_successful_enrichment("One")
+    summary.add_already_enriched("Two")
+    summary.add_error("first")
+    summary.add_error("second")
+
+    summary.print_summary()
+
+    output = capsys.readouterr().out
+    assert summary.successful_enrichments_count == 1
+    assert summary.already_enriched_count == 1
+    assert "ERRORS (2)" in output
+    assert "... 1 earlier entries not kept" in output
+    assert "2. second" in output
+
+
+def test_web_extractor_closes_session():
+    extractor = SummaryAwareWebExtractor(ProcessingSummary())
+
+    with patch.object(extractor._adapter, "close") as mock_close:
+        with extractor as entered:
+            assert entered is extractor
+
+    mock_close.assert_called_once()
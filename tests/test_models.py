@@ -94,6 +94,12 @@ class TestBookmark:
         bookmark_invalid = Bookmark(url="invalid-url")
         assert bookmark_invalid.domain == ""
 
+    def test_bookmark_domain_strips_port_and_userinfo(self):
+        """Test domain normalisation of host parts."""
+        assert Bookmark(url="https://user@Example.COM:8080/a").domain == "example.com"
+        assert Bookmark(url="http://example.com?q=1").domain == "example.com"
+        assert Bookmark(url="http://[::1]:8000/").domain == "[::1]"
+
     def test_bookmark_content_text_property(self):
         """Test content_text property."""
         bookmark1 = Bookmark(url="https://example.com", description="Description")
@@ -135,6 +141,55 @@ class TestBookmark:
         expected = "Example Title Example description tag1 tag2"
         assert bookmark.search_text == expected
 
+    def test_bookmark_search_text_cache_invalidation(self):
+        """Test search_text is recomputed after a source field changes."""
+        bookmark = Bookmark(url="https://example.com", title="Old", tags=["a"])
+        assert bookmark.search_text == "Old a"
+
+        bookmark.title = "New"
+        assert bookmark.search_text == "New a"
+
+        bookmark.tags = ["b", "c"]
+        assert bookmark.search_text == "New b c"
+
+        bookmark.tags.append("d")
+        assert bookmark.search_text == "New b c d"
+        bookmark.tags.remove("d")
+
+        # The cache does not leak into equality or repr
+        assert bookmark == Bookmark(
+            url="https://example.com", title="New", tags=["b", "c"]
+        )
+        assert "_search_text" not in repr(bookmark)
+
+    def test_bookmark_uses_slots(self):
+        """Test bookmarks carry no per-instance __dict__."""
+        bookmark = Bookmark(url="https://example.com")
+        assert not hasattr(bookmark, "__dict__")
+        assert bookmark.tags == []
+
+    def test_bookmark_domain_and_title_cache_invalidation(self):
+        """Test domain and normalized_title follow url and title changes."""
+        bookmark = Bookmark(url="https://example.com/a", title="  Some Title ")
+        assert bookmark.domain == "example.com"
+        assert bookmark.normalized_title == "some title"
+
+        bookmark.url = "https://other.org/b"
+        bookmark.title = "Other"
+        assert bookmark.domain == "other.org"
+        assert bookmark.normalized_title == "other"
+
+    def test_bookmark_query_text_cache_invalidation(self):
+        """Test query_text follows title, description and excerpt changes."""
+        bookmark = Bookmark(url="https://example.com", title="Title", excerpt="Ex")
+        assert bookmark.query_text == "Title Ex"
+
+        bookmark.description = "Desc"
+        assert bookmark.query_text == "Title Desc"
+
+        bookmark.title = ""
+        assert bookmark.query_text == "Desc"
+
     def test_bookmark_defaults(self):
         """Test bookmark with minimal data."""
         bookmark = Bookmark(url="https://example.com")
@@ -33,3 +33,59 @@ def test_set_description():
     tracker = ProgressTracker(total=1, show_progress_bar=False)
     tracker.set_description("New desc")
     assert tracker.description == "New desc"
+
+
+def test_progress_update_with_count():
+    tracker = ProgressTracker(total=10, show_progress_bar=False)
+    tracker.update(count=4)
+    tracker.update(success=False, count=2)
+    assert tracker.completed == 6
+    assert tracker.successful == 4
+    assert tracker.failed == 2
+
+
+def test_update_count_interval_limits_clock_checks():
+    with patch("core.progress_tracker.time.time", return_value=0) as mock_time:
+        tracker = ProgressTracker(
+            total=10,
+            show_progress_bar=True,
+            update_interval=0,
+            update_count_interval=4,
+        )
+        mock_time.reset_mock()
+        with patch.object(ProgressTracker, "_update_display") as mock_display:
+            for _ in range(10):
+                tracker.update()
+
+    # Checkpoints at updates 4 and 8, plus the final update
+    assert mock_time.call_count == 3
+    assert mock_display.call_count == 3
+
+
+def test_shorter_message_pads_over_previous_line():
+    tracker = ProgressTracker(total=10, show_progress_bar=False)
+    tracker._last_message_length = 200
+    with patch.object(builtins, "print") as mock_print:
+        tracker._update_display()
+
+    assert mock_print.call_count == 1
+    assert len(mock_print.call_args.args[0]) == 200
+
+
+def test_eta_uses_recent_uncached_rate():
+    with patch("core.progress_tracker.time.time") as mock_time:
+        mock_time.return_value = 0.0
+        tracker = ProgressTracker(total=20, show_progress_bar=True, update_interval=60)
+        now = 0.0
+        with patch.object(ProgressTracker, "_update_display"):
+            # Ten cached items, then five that take two seconds each
+            for step in [0.01] * 10 + [2.0] * 5:
+                now += step
+                mock_time.return_value = now
+                tracker.update()
+
+        stats = tracker.get_stats()
+
+    assert stats.recent_items_per_second == 0.5
+    assert stats.estimated_remaining_seconds == 10.0
+    assert stats.items_per_second < 1.5
@@ -0,0 +1,26 @@
+import io
+from unittest.mock import patch
+
+from core.spinner import Spinner
+
+
+def test_spinner_writes_message_once_when_not_a_tty():
+    out = io.StringIO()
+    with patch("core.spinner.sys.stdout", out):
+        with Spinner("Working..."):
+            pass
+
+    assert out.getvalue() == "Working...\n"
+
+
+def test_spinner_stops_without_waiting_out_the_frame():
+    out = io.StringIO()
+    out.isatty = lambda: True
+    with patch("core.spinner.sys.stdout", out):
+        spinner = Spinner("Working...")
+        spinner.delay = 10
+        spinner.start()
+        spinner.stop()
+
+    assert spinner.spinner_thread is None
+    assert "Working..." in out.getvalue()
@@ -3,11 +3,17 @@
 from unittest.mock import Mock, patch
 
 from core.category_suggester import CategorySuggester
+from core.vector_store import VectorStore
+
+
+def _summaries_by_size(summaries):
+    """Summaries are requested concurrently, so key them on cluster size."""
+    return lambda group, style_examples="": summaries[len(group)]
 
 
 def test_suggest_categories_basic(sample_bookmarks):
     vs = Mock()
-    vs.get_embeddings.return_value = [0.0]
+    vs.get_cached_embeddings.side_effect = lambda texts: [[0.0] for _ in texts]
     suggester = CategorySuggester(vs)
 
     # Create clusters with at least 3 bookmarks each to pass the new filtering
@@ -15,15 +21,19 @@ def test_suggest_categories_basic(sample_bookmarks):
     extended_bookmarks = sample_bookmarks * 3  # Ensure we have enough bookmarks
 
     with (
-        patch.object(suggester, "_cluster_embeddings", return_value=[0, 0, 0, 1, 1, 1]),
+        patch.object(
+            suggester, "_cluster_embeddings", return_value=[0, 0, 0, 0, 1, 1, 1]
+        ),
         patch("core.category_suggester.ProgressTracker"),
         patch.object(
             suggester,
             "_generate_cluster_summary",
-            side_effect=[
-                {"name": "Cat A", "description": "desc"},
-                {"name": "Cat B", "description": "desc"},
-            ],
+            side_effect=_summaries_by_size(
+                {
+                    4: {"name": "Cat A", "description": "desc"},
+                    3: {"name": "Cat B", "description": "desc"},
+                }
+            ),
         ),
     ):
         suggestions = suggester.suggest(extended_bookmarks)
@@ -37,10 +47,10 @@ def test_suggest_categories_basic(sample_bookmarks):
 def test_suggest_categories_with_kmeans(sample_bookmarks):
     """Test category suggestions with forced K-means clustering."""
     vs = Mock()
-    vs.get_embeddings.return_value = [0.0]
+    vs.get_cached_embeddings.side_effect = lambda texts: [[0.0] for _ in texts]
     suggester = CategorySuggester(vs)
 
-    extended_bookmarks = sample_bookmarks * 2  # 6 bookmarks total
+    extended_bookmarks = sample_bookmarks * 3  # 9 bookmarks total
 
     with (
         patch("sklearn.cluster.KMeans") as mock_kmeans,
@@ -48,20 +58,25 @@ def test_suggest_categories_with_kmeans(sample_bookmarks):
         patch.object(
             suggester,
             "_generate_cluster_summary",
-            side_effect=[
+            side_effect=_summaries_by_size(
                 {
-                    "name": "Tech Resources",
-                    "description": "Technology-related bookmarks",
-                },
-                {"name": "Learning Materials", "description": "Educational content"},
-            ],
+                    5: {
+                        "name": "Tech Resources",
+                        "description": "Technology-related bookmarks",
+                    },
+                    4: {
+                        "name": "Learning Materials",
+                        "description": "Educational content",
+                    },
+                }
+            ),
         ),
     ):
-        # Mock KMeans to return clusters [0, 0, 0, 1, 1, 1] as numpy array
+        # Mock KMeans to return clusters of 5 and 4 as a numpy array
         import numpy as np
 
         mock_instance = Mock()
-        mock_instance.fit_predict.return_value = np.array([0, 0, 0, 1, 1, 1])
+        mock_instance.fit_predict.return_value = np.array([0, 0, 0, 0, 0, 1, 1, 1, 1])
         mock_kmeans.return_value = mock_instance
 
         # Force K-means with k=2
@@ -71,4 +86,239 @@ def test_suggest_categories_with_kmeans(sample_bookmarks):
     assert suggestions[0].name == "Tech Resources"
     assert suggestions[1].name == "Learning Materials"
     # Verify K-means was called with the correct parameters
-    mock_kmeans.assert_called_once_with(n_clusters=2, random_state=42)
+    mock_kmeans.assert_called_once_with(
+        n_clusters=2, random_state=42, n_init=1, algorithm="elkan"
+    )
+
+
+def test_style_examples_come_from_whole_collection(sample_bookmarks):
+    vs = Mock()
+    suggester = CategorySuggester(vs)
+    sample_bookmarks[1].source_file = "dev-tools.json"
+    sample_bookmarks[2].source_file = "export.csv"
+
+    with patch.object(
+        suggester,
+        "_generate_cluster_summary",
+        return_value={"name": "Cat", "description": ""},
+    ) as mock_summary:
+        with (
+            patch.object(suggester, "_cluster_embeddings", return_value=[0, 0, 0]),
+            patch("core.category_suggester.ProgressTracker"),
+        ):
+            vs.get_cached_embeddings.side_effect = lambda texts: [[1.0] for _ in texts]
+            suggester.suggest(sample_bookmarks)
+
+    style = mock_summary.call_args.args[1]
+    assert "dev-tools, test" in style
+    assert "export" not in style
+
+
+def test_cluster_summary_parses_json_with_surrounding_text(sample_bookmarks):
+    suggester = CategorySuggester(Mock())
+    text = (
+        'Sure! {"name": "dev {tools}", "description": "Line one\nline two"} '
+        "Hope that helps {not json}"
+    )
+
+    with patch.object(suggester.ollama_client, "generate") as mock_generate:
+        mock_generate.return_value = {"response": text}
+        meta = suggester._generate_cluster_summary(sample_bookmarks)
+
+    assert meta == {"name": "dev {tools}", "description": "Line one\nline two"}
+    assert mock_generate.call_args.kwargs["format"] == "json"
+    assert mock_generate.call_args.kwargs["options"]["num_predict"] == 120
+
+
+def test_cluster_summary_invalid_json_is_untitled(sample_bookmarks):
+    suggester = CategorySuggester(Mock())
+
+    with patch.object(suggester.ollama_client, "generate") as mock_generate:
+        mock_generate.return_value = {"response": '{"name": '}
+        meta = suggester._generate_cluster_summary(sample_bookmarks)
+
+    assert meta["name"] == "Untitled"
+
+
+def test_hdbscan_clusters_unique_vectors_only():
+    """Repeated vectors are clustered once and share the resulting label."""
+    import numpy as np
+
+    suggester = CategorySuggester(Mock())
+    embeddings = np.array(
+        [[0.0, 1.0], [1.0, 0.0], [0.0, 1.0], [0.0, 1.0], [1.0, 0.0]],
+        dtype=np.float32,
+    )
+    mock_hdbscan = Mock()
+    mock_hdbscan.HDBSCAN.return_value.fit_predict.side_effect = lambda data: (
+        np.array([0 if row[0] == 0.0 else 1 for row in data])
+    )
+
+    with patch.dict("sys.modules", {"hdbscan": mock_hdbscan}):
+        labels = suggester._cluster_embeddings(embeddings)
+
+    fitted = mock_hdbscan.HDBSCAN.return_value.fit_predict.call_args.args[0]
+    assert len(fitted) == 2
+    assert labels == [0, 1, 0, 0, 1]
+
+
+def test_large_collections_use_faiss_kmeans():
+    import numpy as np
+
+    from core import category_suggester
+
+    suggester = CategorySuggester(Mock())
+    embeddings = np.zeros((4, 2), dtype=np.float32)
+    mock_faiss = Mock()
+    mock_faiss.Kmeans.return_value.index.search.return_value = (
+        None,
+        np.array([[0], [1], [0], [1]]),
+    )
+
+    with (
+        patch.object(category_suggester, "FAISS_KMEANS_MIN_SAMPLES", 4),
+        patch.dict("sys.modules", {"faiss": mock_faiss}),
+    ):
+        labels = suggester._cluster_embeddings(embeddings, use_kmeans=2)
+
+    mock_faiss.Kmeans.assert_called_once_with(2, 2, niter=20, seed=42)
+    assert labels == [0, 1, 0, 1]
+
+
+def test_small_collections_skip_faiss_kmeans():
+    import numpy as np
+
+    from core import category_suggester
+
+    suggester = CategorySuggester(Mock())
+    embeddings = np.zeros((3, 2), dtype=np.float32)
+    mock_faiss = Mock()
+
+    with (
+        patch.object(category_suggester, "FAISS_KMEANS_MIN_SAMPLES", 4),
+        patch.dict("sys.modules", {"faiss": mock_faiss}),
+        patch("sklearn.cluster.KMeans") as mock_kmeans,
+    ):
+        mock_kmeans.return_value.fit_predict.return_value = np.array([0, 1, 0])
+        labels = suggester._cluster_embeddings(embeddings, use_kmeans=2)
+
+    mock_faiss.Kmeans.assert_not_called()
+    assert labels == [0, 1, 0]
+
+
+def test_representative_order_puts_centroid_neighbours_first():
+    import numpy as np
+
+    embeddings = np.array(
+        [[10.0, 0.0], [1.0, 0.0], [0.0, 0.0], [2.0, 0.0], [99.0, 0.0]],
+        dtype=np.float32,
+    )
+    sq_norms = (embeddings**2).sum(axis=1)
+
+    # Centroid of rows 0-3 is (3.25, 0)
+    order = CategorySuggester._representative_order(
+        embeddings, sq_norms, [0, 1, 2, 3], n=2
+    )
+
+    assert order == [3, 1, 0, 2]
+
+
+def test_duplicate_texts_are_embedded_once(sample_bookmarks):
+    vs = Mock()
+    vs.get_cached_embeddings.side_effect = lambda texts: [
+        [float(len(text))] for text in texts
+    ]
+    suggester = CategorySuggester(vs)
+
+    with (
+        patch.object(
+            suggester, "_cluster_embeddings", return_value=[-1] * 9
+        ) as mock_cluster,
+        patch("core.category_suggester.ProgressTracker"),
+    ):
+        suggester.suggest(sample_bookmarks * 3)
+
+    embedded = [
+        t for call in vs.get_cached_embeddings.call_args_list for t in call.args[0]
+    ]
+    assert embedded == [b.search_text for b in sample_bookmarks]
+    embeddings = mock_cluster.call_args.args[0]
+    assert embeddings.shape == (9, 1)
+    assert (
+        embeddings[:, 0].tolist() == [len(b.search_text) for b in sample_bookmarks] * 3
+    )
+
+
+def test_reuses_vector_store_embedding_cache(sample_bookmarks):
+    with patch("chromadb.Client"), patch("ollama.Client.embed") as mock_embed:
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[1.0, 0.0] for _ in input]
+        }
+        vs = VectorStore()
+        vs.get_cached_embeddings([b.search_text for b in sample_bookmarks])
+        suggester = CategorySuggester(vs)
+
+        with (
+            patch.object(suggester, "_cluster_embeddings", return_value=[-1] * 3),
+            patch("core.category_suggester.ProgressTracker"),
+        ):
+            suggester.suggest(sample_bookmarks)
+
+    # Vectors embedded for the index are not requested again
+    assert mock_embed.call_count == 1
+
+
+def test_summaries_stop_after_ten_suggestions(sample_bookmarks):
+    vs = Mock()
+    vs.get_cached_embeddings.side_effect = lambda texts: [[0.0] for _ in texts]
+    suggester = CategorySuggester(vs)
+    bookmarks = sample_bookmarks * 15  # 45 bookmarks, 15 clusters of 3
+
+    with (
+        patch.object(
+            suggester,
+            "_cluster_embeddings",
+            return_value=[i // 3 for i in range(len(bookmarks))],
+        ),
+        patch("core.category_suggester.ProgressTracker"),
+        patch.object(
+            suggester,
+            "_generate_cluster_summary",
+            return_value={"name": "Cat", "description": ""},
+        ) as mock_summary,
+    ):
+        suggestions = suggester.suggest(bookmarks)
+
+    assert len(suggestions) == 10
+    # Summaries are requested in waves of 4, so the last wave stops at 12
+    assert mock_summary.call_count == 12
+
+
+def test_clusters_are_bucketed_by_size_and_skip_noise(sample_bookmarks):
+    vs = Mock()
+    vs.get_cached_embeddings.side_effect = lambda texts: [[0.0] for _ in texts]
+    suggester = CategorySuggester(vs)
+    bookmarks = sample_bookmarks * 4  # 12 bookmarks
+
+    # Interleaved labels with noise (-1); label 5 is the largest cluster
+    labels = [2, 5, -1, 5, 2, 5, -1, 2, 5, -1, -1, -1]
+    with (
+        patch.object(suggester, "_cluster_embeddings", return_value=labels),
+        patch("core.category_suggester.ProgressTracker"),
+        patch.object(
+            suggester,
+            "_generate_cluster_summary",
+            side_effect=_summaries_by_size(
+                {
+                    4: {"name": "Big", "description": ""},
+                    3: {"name": "Small", "description": ""},
+                }
+            ),
+        ),
+    ):
+        suggestions = suggester.suggest(bookmarks)
+
+    assert [s.name for s in suggestions] == ["Big", "Small"]
+    assert {id(b) for b in suggestions[1].bookmarks} == {
+        id(bookmarks[i]) for i in (0, 4, 7)
+    }
@@ -3,6 +3,9 @@ Tests for vector store operations.
 """
 
 from unittest.mock import Mock, patch
+
+import pytest
+
 from core.vector_store import VectorStore
 from core.models import Bookmark
 
@@ -15,30 +18,73 @@ class TestVectorStore:
         """Test VectorStore initialization."""
         mock_client = Mock()
         mock_collection = Mock()
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
 
         assert vs.collection_name == "bookmarks"
         assert vs.embedding_model == "nomic-embed-text"
-        mock_client.get_collection.assert_called_once_with(name="bookmarks")
+        assert vs.collection == mock_collection
+        mock_client.get_or_create_collection.assert_called_once_with(
+            name="bookmarks", metadata={"embedding_model": "nomic-embed-text"}
+        )
+
+    @patch("chromadb.Client")
+    def test_vector_store_uses_configured_ollama_host(self, mock_client_class):
+        """Test Ollama requests go to the configured URL."""
+        vs = VectorStore(ollama_url="http://gpu-box:11434")
+
+        assert str(vs.ollama_client._client.base_url) == "http://gpu-box:11434"
 
     @patch("chromadb.Client")
-    def test_vector_store_create_new_collection(self, mock_client_class):
-        """Test creating new collection when none exists."""
+    def test_vector_store_collection_errors_propagate(self, mock_client_class):
+        """Test a failing collection lookup is not mistaken for a missing one."""
         mock_client = Mock()
-        mock_collection = Mock()
-        mock_client.get_collection.side_effect = Exception("Collection not found")
-        mock_client.create_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.side_effect = RuntimeError("disk full")
         mock_client_class.return_value = mock_client
 
-        vs = VectorStore()
+        with pytest.raises(RuntimeError):
+            VectorStore()
 
-        mock_client.create_collection.assert_called_once_with(name="bookmarks")
-        assert vs.collection == mock_collection
+        mock_client.create_collection.assert_not_called()
+
+    @patch("ollama.Client.embed")
+    def test_persistent_store_survives_restart(self, mock_embed, tmp_path):
+        """Test a persisted collection only embeds changes on the next run."""
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[0.1, 0.2, 0.3] for _ in input]
+        }
+        bookmarks = [
+            Bookmark(url="https://a.com", title="A"),
+            Bookmark(url="https://b.com", title="B"),
+        ]
+
+        first = VectorStore(collection_name="persisted", persist_dir=str(tmp_path))
+        assert first.rebuild_from_bookmarks(bookmarks)
+
+        second = VectorStore(collection_name="persisted", persist_dir=str(tmp_path))
+        assert second.get_stats()["total_documents"] == 2
+        bookmarks[1].title = "B changed"
+        with patch.object(second.collection, "upsert") as mock_upsert:
+            assert second.rebuild_from_bookmarks(bookmarks)
+
+        assert mock_upsert.call_args.kwargs["ids"] == ["https://b.com"]
+
+    def test_persistent_store_resets_on_model_change(self, tmp_path):
+        """Test vectors from another embedding model are not reused."""
+        first = VectorStore(collection_name="persisted", persist_dir=str(tmp_path))
+        first.collection.add(ids=["x"], documents=["x"], embeddings=[[0.1, 0.2]])
+
+        other = VectorStore(
+            collection_name="persisted",
+            embedding_model="other-model",
+            persist_dir=str(tmp_path),
+        )
 
-    @patch("ollama.embeddings")
+        assert other.collection.count() == 0
+
+    @patch("ollama.Client.embeddings")
     def test_get_embeddings_success(self, mock_embeddings):
         """Test successful embedding generation."""
         mock_embeddings.return_value = {"embedding": [0.1] * 768}
@@ -51,7 +97,7 @@ class TestVectorStore:
         assert len(embeddings[0]) == 768
         assert embeddings[0][0] == 0.1
 
-    @patch("ollama.embeddings")
+    @patch("ollama.Client.embeddings")
     def test_get_embeddings_error(self, mock_embeddings):
         """Test embedding generation with error."""
         mock_embeddings.side_effect = Exception("API Error")
@@ -64,15 +110,116 @@ class TestVectorStore:
         assert len(embeddings[0]) == 768
         assert all(e == 0.0 for e in embeddings[0])  # Zero vector fallback
 
+    @patch("ollama.Client.embeddings")
+    def test_get_embeddings_zero_vector_only_for_failures(self, mock_embeddings):
+        """Test a failed per-text request does not affect the others."""
+
+        def embed(model, prompt):
+            if prompt == "bad":
+                raise RuntimeError("boom")
+            return {"embedding": [1.0] * 768}
+
+        mock_embeddings.side_effect = embed
+
+        with patch("chromadb.Client"):
+            vs = VectorStore()
+            embeddings = vs.get_embeddings(["good", "bad", "also good"])
+
+        assert embeddings[0] == [1.0] * 768
+        assert embeddings[1] == [0.0] * 768
+        assert embeddings[2] == [1.0] * 768
+
+    @patch("ollama.Client.embed")
+    def test_get_embeddings_batch_chunks_requests(self, mock_embed):
+        """Test batched embeddings send one request per chunk."""
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[float(len(text))] for text in input]
+        }
+
+        with patch("chromadb.Client"):
+            vs = VectorStore(embedding_batch_size=2)
+            embeddings = vs.get_embeddings_batch(["a", "bb", "ccc"])
+
+        assert embeddings == [[1.0], [2.0], [3.0]]
+        assert mock_embed.call_count == 2
+        mock_embed.assert_any_call(model="nomic-embed-text", input=["a", "bb"])
+
+    @patch("ollama.Client.embed")
+    def test_get_embeddings_batch_concurrent_keeps_order(self, mock_embed):
+        """Test concurrent batches come back in input order."""
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[float(text)] for text in input]
+        }
+        texts = [str(i) for i in range(10)]
+
+        with patch("chromadb.Client"):
+            vs = VectorStore(embedding_batch_size=3, embedding_workers=4)
+            embeddings = vs.get_embeddings_batch(texts)
+
+        assert embeddings == [[float(i)] for i in range(10)]
+        assert mock_embed.call_count == 4
+
+    @patch("ollama.Client.embeddings")
+    @patch("ollama.Client.embed")
+    def test_get_embeddings_batch_falls_back(self, mock_embed, mock_embeddings):
+        """Test batched embeddings fall back to per-text requests."""
+        mock_embed.side_effect = KeyError("embeddings")
+        mock_embeddings.return_value = {"embedding": [0.5] * 768}
+
+        with patch("chromadb.Client"):
+            vs = VectorStore()
+            embeddings = vs.get_embeddings_batch(["one", "two"])
+
+        assert len(embeddings) == 2
+        assert mock_embeddings.call_count == 2
+
+    @patch("ollama.Client.embed")
+    def test_document_embeddings_reuse_cache(self, mock_embed):
+        """Test cached document embeddings are not requested again."""
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[1.0, 2.0] for _ in input]
+        }
+
+        with patch("chromadb.Client"):
+            vs = VectorStore()
+            vs.get_cached_embeddings(["cached"])
+            embeddings = vs.get_cached_embeddings(["cached", "fresh"])
+
+        assert embeddings == [[1.0, 2.0], [1.0, 2.0]]
+        assert mock_embed.call_count == 2
+        mock_embed.assert_called_with(model="nomic-embed-text", input=["fresh"])
+
+    @patch("chromadb.Client")
+    @patch("ollama.Client.embed")
+    def test_search_reuses_cached_query_embedding(self, mock_embed, mock_client_class):
+        """Test repeated queries are embedded only once."""
+        mock_embed.return_value = {"embeddings": [[0.1] * 768]}
+        mock_collection = Mock()
+        mock_collection.query.return_value = {
+            "documents": [[]],
+            "metadatas": [[]],
+            "distances": [[]],
+        }
+        mock_client_class.return_value.get_or_create_collection.return_value = (
+            mock_collection
+        )
+
+        vs = VectorStore()
+        vs.search("same query")
+        vs.search("same query")
+
+        assert mock_embed.call_count == 1
+        assert mock_collection.query.call_count == 2
+
     @patch("chromadb.Client")
-    @patch("ollama.embeddings")
-    def test_add_bookmarks_success(self, mock_embeddings, mock_client_class):
+    @patch("ollama.Client.embed")
+    def test_add_bookmarks_success(self, mock_embed, mock_client_class):
         """Test successful bookmark addition."""
         # Setup mocks
-        mock_embeddings.return_value = {"embedding": [0.1] * 768}
+        mock_embed.return_value = {"embeddings": [[0.1] * 768]}
         mock_client = Mock()
         mock_collection = Mock()
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -91,11 +238,45 @@ class TestVectorStore:
         assert result is True
         mock_collection.add.assert_called_once()
 
+    @patch("chromadb.Client")
+    def test_add_bookmarks_writes_in_batches(self, mock_client_class):
+        """Test large additions are embedded and written in slices."""
+        mock_client = Mock()
+        mock_collection = Mock()
+        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_client_class.return_value = mock_client
+
+        vs = VectorStore()
+        vs.get_cached_embeddings = Mock(
+            side_effect=lambda texts: [[0.1] * 768 for _ in texts]
+        )
+        bookmarks = [
+            Bookmark(url=f"https://example.com/{i}", title=f"Page {i}")
+            for i in range(5)
+        ]
+
+        with patch("core.vector_store.CHROMA_WRITE_BATCH_SIZE", 2):
+            assert vs.add_bookmarks(bookmarks) is True
+
+        sizes = [len(c.kwargs["ids"]) for c in mock_collection.add.call_args_list]
+        assert sizes == [2, 2, 1]
+        assert [len(c.args[0]) for c in vs.get_cached_embeddings.call_args_list] == [
+            2,
+            2,
+            1,
+        ]
+        written = [
+            meta["url"]
+            for c in mock_collection.add.call_args_list
+            for meta in c.kwargs["metadatas"]
+        ]
+        assert written == [b.url for b in bookmarks]
+
     @patch("chromadb.Client")
     def test_add_bookmarks_empty_list(self, mock_client_class):
         """Test adding empty bookmark list."""
         mock_client = Mock()
-        mock_client.get_collection.return_value = Mock()
+        mock_client.get_or_create_collection.return_value = Mock()
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -107,7 +288,7 @@ class TestVectorStore:
     def test_add_bookmarks_invalid_bookmark(self, mock_client_class):
         """Test adding bookmark with no URL."""
         mock_client = Mock()
-        mock_client.get_collection.return_value = Mock()
+        mock_client.get_or_create_collection.return_value = Mock()
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -119,11 +300,11 @@ class TestVectorStore:
         assert result is False  # No valid documents to add
 
     @patch("chromadb.Client")
-    @patch("ollama.embeddings")
-    def test_search_success(self, mock_embeddings, mock_client_class):
+    @patch("ollama.Client.embed")
+    def test_search_success(self, mock_embed, mock_client_class):
         """Test successful search."""
         # Setup mocks
-        mock_embeddings.return_value = {"embedding": [0.1] * 768}
+        mock_embed.return_value = {"embeddings": [[0.1] * 768]}
         mock_client = Mock()
         mock_collection = Mock()
         mock_collection.query.return_value = {
@@ -133,7 +314,7 @@ class TestVectorStore:
             ],
             "distances": [[0.2]],
         }
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -145,11 +326,11 @@ class TestVectorStore:
         assert result.similar_bookmarks[0].bookmark.url == "https://example.com"
 
     @patch("chromadb.Client")
-    @patch("ollama.embeddings")
-    def test_search_no_results(self, mock_embeddings, mock_client_class):
+    @patch("ollama.Client.embed")
+    def test_search_no_results(self, mock_embed, mock_client_class):
         """Test search with no results."""
         # Setup mocks
-        mock_embeddings.return_value = {"embedding": [0.1] * 768}
+        mock_embed.return_value = {"embeddings": [[0.1] * 768]}
         mock_client = Mock()
         mock_collection = Mock()
         mock_collection.query.return_value = {
@@ -157,7 +338,7 @@ class TestVectorStore:
             "metadatas": [[]],
             "distances": [[]],
         }
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -173,7 +354,7 @@ class TestVectorStore:
         mock_client = Mock()
         mock_collection = Mock()
         mock_client.delete_collection.return_value = None
-        mock_client.create_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -188,7 +369,7 @@ class TestVectorStore:
         mock_client = Mock()
         mock_collection = Mock()
         mock_collection.count.return_value = 42
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         vs = VectorStore()
@@ -203,9 +384,8 @@ class TestVectorStore:
         """Test rebuilding vector store from bookmarks."""
         mock_client = Mock()
         mock_collection = Mock()
-        mock_client.get_collection.return_value = mock_collection
+        mock_client.get_or_create_collection.return_value = mock_collection
         mock_client.delete_collection.return_value = None
-        mock_client.create_collection.return_value = mock_collection
         mock_client_class.return_value = mock_client
 
         with patch.object(VectorStore, "add_bookmarks", return_value=True) as mock_add:
@@ -215,3 +395,102 @@ class TestVectorStore:
 
             assert result is True
             mock_add.assert_called_once_with(bookmarks)
+
+    def test_prepare_documents_ids_are_stable_urls(self):
+        """Test ids come from URLs, with a suffix for repeated URLs."""
+        bookmarks = [
+            Bookmark(url="https://a.com", title="A"),
+            Bookmark(url="https://a.com", title="A again"),
+            Bookmark(url="https://b.com", title="B"),
+            Bookmark(url="https://a.com", title="A third"),
+        ]
+
+        _, _, ids = VectorStore._prepare_documents(bookmarks)
+
+        assert ids == [
+            "https://a.com",
+            "https://a.com_1",
+            "https://b.com",
+            "https://a.com_2",
+        ]
+
+    def test_prepare_documents_suffix_skips_taken_ids(self):
+        """Test a suffixed id never collides with a literal URL."""
+        bookmarks = [
+            Bookmark(url="https://a.com", title="A"),
+            Bookmark(url="https://a.com_1", title="Literal"),
+            Bookmark(url="https://a.com", title="A again"),
+            Bookmark(url="https://a.com", title="A third"),
+        ]
+
+        _, _, ids = VectorStore._prepare_documents(bookmarks)
+
+        assert ids == [
+            "https://a.com",
+            "https://a.com_1",
+            "https://a.com_2",
+            "https://a.com_3",
+        ]
+
+
+class TestVectorStoreSearchBatch:
+    """Test batched searches."""
+
+    @patch("chromadb.Client")
+    def test_search_batch_queries_once(self, mock_client_class):
+        """Test all queries are embedded and searched in one call each."""
+        mock_collection = Mock()
+        mock_collection.query.return_value = {
+            "documents": [["doc a"], []],
+            "metadatas": [[{"url": "https://a.com", "title": "A"}], []],
+            "distances": [[0.25], []],
+        }
+        mock_client_class.return_value.get_or_create_collection.return_value = (
+            mock_collection
+        )
+
+        vs = VectorStore()
+        with patch.object(
+            vs, "get_embeddings_batch", return_value=[[1.0], [2.0]]
+        ) as mock_embed:
+            results = vs.search_batch(["first", "second"], n_results=3)
+
+        mock_embed.assert_called_once_with(["first", "second"])
+        mock_collection.query.assert_called_once_with(
+            query_embeddings=[[1.0], [2.0]], n_results=3
+        )
+        assert [r.query for r in results] == ["first", "second"]
+        assert results[0].similar_bookmarks[0].bookmark.url == "https://a.com"
+        assert results[0].similar_bookmarks[0].similarity_score == 0.75
+        assert results[1].total_results == 0
+
+
+class TestVectorStoreSync:
+    """Test incremental syncing against a real in-memory collection."""
+
+    @patch("ollama.Client.embed")
+    def test_sync_only_touches_changed_bookmarks(self, mock_embed):
+        """Test unchanged bookmarks are not re-embedded and removed ones go."""
+        mock_embed.side_effect = lambda model, input: {
+            "embeddings": [[float(len(text)), 1.0] for text in input]
+        }
+        vs = VectorStore(collection_name="test_sync_bookmarks")
+        vs.clear()
+        keep = Bookmark(url="https://keep.com", title="Keep")
+        edit = Bookmark(url="https://edit.com", title="Edit")
+        drop = Bookmark(url="https://drop.com", title="Drop")
+
+        assert vs.sync_bookmarks([keep, edit, drop])
+        edit.title = "Edited"
+        with patch.object(
+            vs, "get_cached_embeddings", wraps=vs.get_cached_embeddings
+        ) as mock_embed_docs:
+            assert vs.sync_bookmarks([keep, edit])
+
+        mock_embed_docs.assert_called_once_with(["Edited"])
+        stored = vs.collection.get()
+        assert sorted(stored["ids"]) == ["https://edit.com", "https://keep.com"]
+
+        with patch.object(vs, "get_cached_embeddings") as mock_unchanged:
+            assert vs.sync_bookmarks([keep, edit])
+        mock_unchanged.assert_not_called()
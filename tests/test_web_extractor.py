@@ -2,9 +2,10 @@
 Tests for web content extraction.
 """
 
+import threading
 import requests
 from unittest.mock import Mock, patch
-from core.web_extractor import WebExtractor
+from core.web_extractor import HostRateLimiter, WebExtractor
 
 
 class TestWebExtractor:
@@ -16,7 +17,16 @@ class TestWebExtractor:
         assert extractor.timeout == 15
         assert "User-Agent" in extractor.headers
 
-    @patch("requests.get")
+    def test_session_retries_only_transient_statuses(self):
+        """Test pooled adapters retry 5xx/429 but not dead hosts."""
+        extractor = WebExtractor()
+        retries = extractor.session.get_adapter("https://example.com").max_retries
+
+        assert retries.total == 2
+        assert retries.connect == 0
+        assert 503 in retries.status_forcelist
+
+    @patch("requests.Session.get")
     def test_extract_content_success(self, mock_get, mock_web_response):
         """Test successful content extraction."""
         # Mock successful response
@@ -32,7 +42,53 @@ class TestWebExtractor:
         assert description == "Test page description"
         mock_get.assert_called_once()
 
-    @patch("requests.get")
+    def test_parse_html_keeps_only_metadata(self, mock_web_response):
+        """Test page parsing skips everything but title and meta tags."""
+        soup = WebExtractor._parse_html(mock_web_response.encode("utf-8"))
+
+        assert soup.find("h1") is None
+        assert soup.find("title").text == "Test Page Title"
+        assert soup.find("meta", attrs={"name": "description"}) is not None
+
+    def test_parse_html_ignores_body_after_head(self):
+        """Test tags after </head> are not parsed."""
+        html = (
+            b"<html><head><title>Head</title></HEAD >"
+            b'<body><meta name="description" content="Body"><title>Svg</title>'
+            b"</body></html>"
+        )
+        soup = WebExtractor._parse_html(html)
+
+        assert [t.text for t in soup.find_all("title")] == ["Head"]
+        assert soup.find("meta") is None
+
+    def test_extract_many_keeps_order(self):
+        """Test concurrent extraction returns results in input order."""
+        extractor = WebExtractor(pool_size=4)
+        urls = [f"https://example.com/{i}" for i in range(10)]
+        with patch.object(
+            extractor, "extract_content", side_effect=lambda url: (url, "")
+        ):
+            results = extractor.extract_many(urls)
+
+        assert [title for title, _ in results] == urls
+        assert extractor.extract_many([]) == []
+
+    def test_sessions_are_per_thread_with_shared_pool(self):
+        """Test each thread gets its own session over one connection pool."""
+        extractor = WebExtractor()
+        sessions = []
+        worker = threading.Thread(target=lambda: sessions.append(extractor.session))
+        worker.start()
+        worker.join()
+
+        assert extractor.session is extractor.session
+        assert sessions[0] is not extractor.session
+        assert sessions[0].get_adapter(
+            "https://a.example"
+        ) is extractor.session.get_adapter("https://b.example")
+
+    @patch("requests.Session.get")
     def test_extract_content_timeout(self, mock_get):
         """Test content extraction with timeout."""
         mock_get.side_effect = requests.exceptions.Timeout()
@@ -43,7 +99,7 @@ class TestWebExtractor:
         assert title == ""
         assert description == ""
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_extract_content_request_error(self, mock_get):
         """Test content extraction with request error."""
         mock_get.side_effect = requests.exceptions.RequestException("Connection error")
@@ -54,7 +110,7 @@ class TestWebExtractor:
         assert title == ""
         assert description == ""
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_extract_content_with_og_description(self, mock_get):
         """Test extraction with Open Graph description."""
         html_content = """
@@ -77,7 +133,7 @@ class TestWebExtractor:
         assert title == "Test Title"
         assert description == "Open Graph description"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_extract_content_with_twitter_description(self, mock_get):
         """Test extraction with Twitter card description."""
         html_content = """
@@ -100,7 +156,7 @@ class TestWebExtractor:
         assert title == "Test Title"
         assert description == "Twitter description"
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_extract_content_no_meta(self, mock_get):
         """Test extraction with no meta description."""
         html_content = """
@@ -122,7 +178,7 @@ class TestWebExtractor:
         assert title == "Test Title"
         assert description == ""
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_is_valid_url_success(self, mock_head):
         """Test URL validation with successful response."""
         mock_response = Mock()
@@ -132,7 +188,7 @@ class TestWebExtractor:
         extractor = WebExtractor()
         assert extractor.is_valid_url("https://example.com")
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_is_valid_url_client_error(self, mock_head):
         """Test URL validation with client error."""
         mock_response = Mock()
@@ -142,7 +198,7 @@ class TestWebExtractor:
         extractor = WebExtractor()
         assert not extractor.is_valid_url("https://example.com/nonexistent")
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_is_valid_url_server_error(self, mock_head):
         """Test URL validation with server error."""
         mock_response = Mock()
@@ -158,7 +214,7 @@ class TestWebExtractor:
         assert not extractor.is_valid_url("not-a-url")
         assert not extractor.is_valid_url("ftp://example.com")  # Missing scheme/netloc
 
-    @patch("requests.head")
+    @patch("requests.Session.head")
     def test_is_valid_url_exception(self, mock_head):
         """Test URL validation with exception."""
         mock_head.side_effect = requests.exceptions.RequestException()
@@ -177,3 +233,28 @@ class TestWebExtractor:
         )
         assert extractor.extract_domain("invalid-url") == ""
         assert extractor.extract_domain("") == ""
+
+    def test_host_rate_limiter_spaces_same_host(self):
+        """Test requests to one host are spaced while other hosts proceed."""
+        limiter = HostRateLimiter(min_interval=0.5)
+
+        with (
+            patch("core.web_extractor.time.monotonic", return_value=100.0),
+            patch("core.web_extractor.time.sleep") as mock_sleep,
+        ):
+            limiter.wait("https://example.com/a")
+            limiter.wait("https://other.com/")
+            limiter.wait("https://example.com/b")
+
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch("requests.Session.head")
+    def test_link_checks_are_rate_limited(self, mock_head):
+        """Test HEAD checks go through the per-host rate limiter."""
+        mock_head.return_value = Mock(status_code=200)
+
+        extractor = WebExtractor()
+        with patch.object(extractor.rate_limiter, "wait") as mock_wait:
+            assert extractor.is_valid_url("https://example.com/a")
+
+        mock_wait.assert_called_once_with("https://example.com/a")